@@ -12,6 +12,7 @@ import signal
 import subprocess
 import sys
 import tempfile
+import threading
 import time
 from datetime import datetime
 from pathlib import Path
@@ -28,6 +29,35 @@ SCRIPT_DIR = Path(__file__).parent
 AI_CLI_PATH = SCRIPT_DIR / "ai-cli.sh"
 
 
+# AIDEV-NOTE: AI calls made from worker threads (meta_learning's pool) would
+# otherwise hold up interpreter exit until they finish or time out: the CLI
+# runs in its own session, so a Ctrl-C never reaches it, and executor threads
+# are joined at exit. cancel_ai_calls() kills the in-flight ones and makes any
+# later call or retry fail fast.
+_active_procs = set()
+_active_lock = threading.Lock()
+_cancelled = threading.Event()
+
+
+def _kill_ai_process(proc: subprocess.Popen):
+    try:
+        os.killpg(proc.pid, signal.SIGKILL)  # Session leader, so pgid == pid
+    except OSError:
+        pass
+
+
+def cancel_ai_calls():
+    """
+    Kill in-flight AI calls and fail all later ones. For shutdown paths only:
+    the process can't make AI calls again afterwards.
+    """
+    _cancelled.set()
+    with _active_lock:
+        procs = list(_active_procs)
+    for proc in procs:
+        _kill_ai_process(proc)
+
+
 class AIError(Exception):
     """Base exception for AI errors."""
     pass
@@ -321,6 +351,9 @@ def call_ai_model(
 
     timeout_secs = get_model_timeout(model_name)
 
+    if _cancelled.is_set():
+        raise AIError("AI calls cancelled (shutting down)")
+
     try:
         # Use Popen with process group so we can kill all children on timeout
         proc = subprocess.Popen(
@@ -332,6 +365,11 @@ def call_ai_model(
             env=env,
             start_new_session=True,  # Creates new process group
         )
+        with _active_lock:
+            _active_procs.add(proc)
+        # Checked after registering, so a concurrent cancel_ai_calls can't miss it
+        if _cancelled.is_set():
+            _kill_ai_process(proc)
 
         try:
             output, stderr = proc.communicate(timeout=timeout_secs)
@@ -347,6 +385,12 @@ def call_ai_model(
             proc.kill()
             proc.wait()
             raise TimeoutError(f"AI call timed out (model: {model_name})")
+        finally:
+            with _active_lock:
+                _active_procs.discard(proc)
+
+        if _cancelled.is_set():
+            raise AIError(f"AI call cancelled (model: {model_name})")
 
         # Print stderr (contains debug info)
         if stderr:
@@ -399,6 +443,8 @@ def _try_models_with_backoff(
         _log(f"{tier_name} round {round_num + 1}/{max_rounds}: trying {len(shuffled_models)} models")
 
         for model in shuffled_models:
+            if _cancelled.is_set():
+                return None, None, last_errors
             try:
                 _log(f"Trying {model}...")
                 output, model_name = call_ai_model(prompt, model, working_dir, env_vars)
@@ -414,7 +460,8 @@ def _try_models_with_backoff(
         # All models failed in this round
         if round_num < max_rounds - 1:
             _log(f"All {tier_name} models failed in round {round_num + 1}, waiting {wait_time}s...")
-            time.sleep(wait_time)
+            if _cancelled.wait(wait_time):
+                return None, None, last_errors
             wait_time = min(wait_time * 2, max_wait)
 
     return None, None, last_errors
@@ -11,7 +11,7 @@ import os
 import tempfile
 import fcntl
 import time
-from typing import List, Tuple, Optional, Dict, Any
+from typing import List, Set, Tuple, Optional, Dict, Any
 
 
 def parse_generation(candidate_id: str) -> Optional[int]:
@@ -371,6 +371,89 @@ class EvolutionCSV:
 
         return updated
         
+    def update_candidate_fields(self, candidate_id: str, fields: Dict[str, str]) -> bool:
+        """
+        Update several fields of a candidate with a single read/write of the CSV.
+
+        'performance' and 'status' always go to their fixed columns (like
+        update_candidate_performance/update_candidate_status); other fields are
+        matched against the header and added as new columns if missing, as in
+        update_candidate_field. Unknown fields are skipped when there is no header.
+        """
+        rows = self._read_csv()
+        if not rows or not fields:
+            return False
+
+        has_header = rows and rows[0] and rows[0][0].lower() == 'id'
+        header_row = rows[0] if has_header else None
+        positional = {
+            'id': 0,
+            'basedonid': 1,
+            'description': 2,
+            'performance': 3,
+            'status': 4,
+            'idea-llm': 5,
+            'run-llm': 6
+        }
+
+        # Resolve a column index for every field
+        field_indices = []
+        added_column = False
+        for field_name, value in fields.items():
+            field_lower = field_name.lower()
+            if field_lower in ('performance', 'status'):
+                field_index = positional[field_lower]
+            elif has_header:
+                field_index = None
+                for i, col in enumerate(header_row):
+                    if col.lower() == field_lower:
+                        field_index = i
+                        break
+                if field_index is None:
+                    field_index = len(header_row)
+                    header_row.append(field_name)
+                    added_column = True
+            else:
+                field_index = positional.get(field_lower)
+                if field_index is None:
+                    continue
+            field_indices.append((field_index, value))
+
+        if not field_indices:
+            return False
+
+        if added_column:
+            # Extend all data rows with empty values for the new columns
+            for i in range(1, len(rows)):
+                while len(rows[i]) < len(header_row):
+                    rows[i].append('')
+
+        max_index = max(index for index, _ in field_indices)
+        search_id = candidate_id.strip().strip('"')
+        updated = False
+        update_count = 0
+        start_idx = 1 if has_header else 0
+
+        # Update ALL matching rows (in case of duplicates)
+        for i in range(start_idx, len(rows)):
+            row = rows[i]
+            if self.is_valid_candidate_row(row) and row[0].strip().strip('"') == search_id:
+                # Ensure row has enough columns
+                while len(row) <= max_index:
+                    row.append('')
+                for field_index, value in field_indices:
+                    row[field_index] = value
+                updated = True
+                update_count += 1
+
+        if update_count > 1:
+            print(f'[WARN] Updated {update_count} duplicate entries for candidate {candidate_id} fields {", ".join(fields)}', file=sys.stderr)
+
+        if updated:
+            self._write_csv(rows)
+
+        return updated
+
     def get_candidate_info(self, candidate_id: str) -> Optional[Dict[str, str]]:
         """Get information about a specific candidate."""
         rows = self._read_csv()
@@ -425,6 +508,95 @@ class EvolutionCSV:
             
         return deleted
 
+    @property
+    def pending_journal_path(self) -> str:
+        """Path of the journal interrupted workers append their candidate IDs to."""
+        return f"{self.csv_path}.pending.jrnl"
+
+    def replay_pending_journal(self) -> int:
+        """
+        Reset candidates recorded in the pending journal back to 'pending'.
+
+        AIDEV-NOTE: Worker signal handlers append the ID they were processing to
+        the journal (one os.write) instead of rewriting the CSV while being torn
+        down. The journal is claimed by rename so concurrent replays never apply
+        the same entries twice. Call with the lock held.
+        Returns the number of rows reset.
+        """
+        journal_path = self.pending_journal_path
+        claimed_path = f"{journal_path}.{os.getpid()}"
+        try:
+            os.rename(journal_path, claimed_path)
+        except FileNotFoundError:
+            return 0
+
+        # The claimed file is only removed once the CSV write has succeeded
+        try:
+            with open(claimed_path, 'r') as f:
+                candidate_ids = {line.strip() for line in f if line.strip()}
+            reset_count = self._reset_journal_candidates(candidate_ids)
+        except BaseException:
+            self._restore_claimed_journal(claimed_path, journal_path)
+            raise
+
+        os.unlink(claimed_path)
+        return reset_count
+
+    def _reset_journal_candidates(self, candidate_ids: Set[str]) -> int:
+        """Reset the given in-flight candidates to 'pending'; returns the count."""
+        if not candidate_ids:
+            return 0
+
+        rows = self._read_csv()
+        if not rows:
+            return 0
+
+        start_idx = 1 if rows and rows[0] and rows[0][0].lower() == 'id' else 0
+        reset_count = 0
+
+        for i in range(start_idx, len(rows)):
+            row = rows[i]
+            if not self.is_valid_candidate_row(row) or row[0].strip().strip('"') not in candidate_ids:
+                continue
+            status = row[4].strip().lower() if len(row) > 4 else ''
+            # Don't reset if already complete or permanently failed
+            if status in ('complete', 'failed', 'failed-ai-retry', 'failed-parent-missing'):
+                continue
+            while len(row) < 5:
+                row.append('')
+            row[4] = 'pending'
+            reset_count += 1
+
+        if reset_count:
+            self._write_csv(rows)
+
+        return reset_count
+
+    @staticmethod
+    def _restore_claimed_journal(claimed_path: str, journal_path: str) -> None:
+        """
+        Hand a claimed journal back so the next replay retries its entries.
+
+        Links it back if no new journal exists yet (link, unlike rename, can't
+        clobber one a worker just created), otherwise appends its entries to
+        the new one. If even that fails the claimed file is left in place
+        rather than lost.
+        """
+        try:
+            try:
+                os.link(claimed_path, journal_path)
+            except FileExistsError:
+                with open(claimed_path, 'rb') as f:
+                    entries = f.read()
+                fd = os.open(journal_path, os.O_WRONLY | os.O_CREAT | os.O_APPEND, 0o644)
+                try:
+                    os.write(fd, entries)
+                finally:
+                    os.close(fd)
+            os.unlink(claimed_path)
+        except OSError as e:
+            print(f"[WARN] Could not restore pending journal {claimed_path}: {e}", file=sys.stderr)
+
     def cleanup_corrupted_status_fields(self) -> int:
         """
         Detect and fix corrupted status fields (e.g., with embedded newlines).
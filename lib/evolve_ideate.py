@@ -20,7 +20,8 @@ from typing import List, Optional, Dict, Tuple
 
 # Add lib to path
 SCRIPT_DIR = Path(__file__).parent
-sys.path.insert(0, str(SCRIPT_DIR.parent))
+if str(SCRIPT_DIR.parent) not in sys.path:
+    sys.path.insert(0, str(SCRIPT_DIR.parent))
 
 from lib.evolution_csv import EvolutionCSV
 from lib.ai_cli import call_ai_with_backoff, get_git_protection_warning, AIError
@@ -23,7 +23,8 @@ from typing import List, Optional, Set
 
 # Add lib to path
 SCRIPT_DIR = Path(__file__).parent
-sys.path.insert(0, str(SCRIPT_DIR.parent))
+if str(SCRIPT_DIR.parent) not in sys.path:
+    sys.path.insert(0, str(SCRIPT_DIR.parent))
 
 from lib.evolution_csv import EvolutionCSV
 from lib.log import log, log_error, log_warn, set_prefix, init_file_logging
@@ -59,6 +60,7 @@ class WorkerPool:
         # (None = no filter, process all pending candidates).
         self.min_generation: Optional[int] = None
         self.workers: dict[int, subprocess.Popen] = {}  # pid -> process
+        self.worker_slots: dict[int, int] = {}  # pid -> slot index (0..max_workers-1)
 
     def spawn_worker(self) -> Optional[int]:
         """Spawn a new worker. Returns pid or None if at capacity."""
@@ -81,8 +83,13 @@ class WorkerPool:
             # a closed/bad stdin FD from parent (e.g. when run via nohup or after
             # terminal disconnect). Without this, Python workers crash at startup
             # with "OSError: [Errno 9] Bad file descriptor" on sys stream init.
-            proc = subprocess.Popen(cmd, stdin=subprocess.DEVNULL)
+            # Stable per-slot index, used by workers for optional CPU pinning
+            used_slots = set(self.worker_slots.values())
+            slot = next(i for i in range(self.max_workers + 1) if i not in used_slots)
+            env = {**os.environ, 'CLAUDE_EVOLVE_WORKER_INDEX': str(slot)}
+            proc = subprocess.Popen(cmd, stdin=subprocess.DEVNULL, env=env)
             self.workers[proc.pid] = proc
+            self.worker_slots[proc.pid] = slot
             log(f"Spawned worker {proc.pid}")
             return proc.pid
         except Exception as e:
@@ -103,6 +110,7 @@ class WorkerPool:
 
         for pid in finished_pids:
             del self.workers[pid]
+            self.worker_slots.pop(pid, None)
 
         return exit_codes
 
@@ -136,6 +144,7 @@ class WorkerPool:
                 pass
 
         self.workers.clear()
+        self.worker_slots.clear()
 
     @property
     def active_count(self) -> int:
@@ -181,6 +190,11 @@ class EvolutionRunner:
             if removed:
                 log(f"Removed {removed} duplicate candidates")
 
+            # Apply resets journaled by interrupted workers
+            replayed = csv.replay_pending_journal()
+            if replayed:
+                log(f"Reset {replayed} interrupted candidates")
+
             # Reset stuck candidates
             reset = csv.reset_stuck_candidates()
             if reset:
@@ -22,13 +22,15 @@ import signal
 import subprocess
 import sys
 import time
+import traceback
 from dataclasses import dataclass
 from pathlib import Path
-from typing import Optional, Tuple, Dict, Any
+from typing import Optional, Tuple, Dict, Any, List, Iterable, Union
 
 # Add lib to path
 SCRIPT_DIR = Path(__file__).parent
-sys.path.insert(0, str(SCRIPT_DIR.parent))
+if str(SCRIPT_DIR.parent) not in sys.path:
+    sys.path.insert(0, str(SCRIPT_DIR.parent))
 
 from lib.log import log, log_error, log_warn, log_debug, set_prefix, init_file_logging
 set_prefix("WORKER")
@@ -38,7 +40,103 @@ from lib.ai_cli import (
     call_ai_with_backoff, call_ai_escalation, call_ai_model,
     get_models_for_command, get_git_protection_warning, AIError
 )
-from lib.llm_bandit import LLMBandit
+from lib.llm_bandit import get_bandit_for_evolution
+
+# Parent IDs may list several parents separated by commas, semicolons or spaces
+_PARENT_SPLIT_RE = re.compile(r'[,;\s]+')
+# Legacy "SCORE: <value>" evaluator output
+_SCORE_RE = re.compile(r'^SCORE:\s*([+-]?\d*\.?\d+)', re.MULTILINE)
+# First/last characters of a line that float() could accept as a bare score
+_NUMERIC_START = frozenset('+-.0123456789')
+_NUMERIC_END = frozenset('.0123456789')
+
+
+# AIDEV-NOTE: Prompt templates are filled with str.format_map; only the
+# {placeholders} below are substituted, so candidate text may contain braces.
+_BASE_PROMPT_TMPL = """{git_warning}
+
+Modify the algorithm in {target_basename} based on this description: {description}
+
+The modification should be substantial and follow the description exactly. Make sure the algorithm still follows all interface requirements and can run properly.
+
+Important: Make meaningful changes that match the description. Don't just add comments or make trivial adjustments.
+
+IMPORTANT: If you need to read Python (.py) or CSV files, read them in chunks using offset and limit parameters to avoid context overload
+Example: Read(file_path='evolution_gen01-001.py', offset=0, limit=100) then Read(offset=100, limit=100), etc.
+This is especially important for models with smaller context windows.
+
+CRITICAL: If you do not know how to implement what was asked for, or if the requested change is unclear or not feasible, you MUST refuse to make any changes. DO NOT modify the code if you are uncertain about the implementation. Simply respond that you cannot implement the requested change and explain why. It is better to refuse than to make incorrect or random changes."""
+
+_FIX_PROMPT_HEADER_TMPL = """{git_warning}
+
+The code in {target_basename} failed validation. Please fix the errors and try again.
+
+## Validator Output
+
+"""
+
+_FIX_PROMPT_FOOTER_TMPL = """## Instructions
+
+1. Read the file {target_basename} to understand the current code
+2. Identify the issue based on the validator output above
+3. Fix the code to resolve the validation error
+4. The fix should still implement: {description}
+
+**CRITICAL:** Make sure to actually fix the error. Do not just add comments or make cosmetic changes.
+
+To help debug, you can run the validator yourself:
+```
+python validator.py {target_basename}
+```
+"""
+
+# Linux ioctl to share extents between files (reflink) on Btrfs/XFS/bcachefs
+_FICLONE = 0x40049409
+
+
+def _fast_copy(src: Path, dst: Path) -> None:
+    """
+    Copy src to dst, using a copy-on-write clone when the filesystem supports it.
+
+    AIDEV-NOTE: Tries a reflink (FICLONE on Linux, clonefile() on macOS/APFS),
+    which shares blocks until the AI rewrites the file, then falls back to
+    shutil.copy. Hardlinks are deliberately not used - an AI that edits in
+    place would silently modify the parent algorithm too.
+    """
+    try:
+        if sys.platform.startswith('linux'):
+            import fcntl
+            with open(src, 'rb') as fsrc, open(dst, 'wb') as fdst:
+                fcntl.ioctl(fdst.fileno(), _FICLONE, fsrc.fileno())
+            shutil.copymode(src, dst)
+            return
+        if sys.platform == 'darwin':
+            import ctypes
+            libc = ctypes.CDLL(None, use_errno=True)
+            if libc.clonefile(os.fsencode(src), os.fsencode(dst), 0) == 0:
+                return
+    except (OSError, AttributeError):
+        pass
+    shutil.copy(src, dst)
+
+
+def _same_python_version(python_cmd: str) -> bool:
+    """True if python_cmd is this interpreter or has the same major.minor version."""
+    resolved = shutil.which(python_cmd)
+    if resolved is None:
+        return False
+    if os.path.realpath(resolved) == os.path.realpath(sys.executable):
+        return True
+    try:
+        result = subprocess.run(
+            [resolved, "-c", "import sys; print('%d.%d' % sys.version_info[:2])"],
+            capture_output=True,
+            text=True,
+            timeout=30
+        )
+    except (OSError, subprocess.TimeoutExpired):
+        return False
+    return result.returncode == 0 and result.stdout.strip() == '%d.%d' % sys.version_info[:2]
 
 
 @dataclass
@@ -59,6 +157,7 @@ class Config:
     max_validation_retries: int = 3  # Max attempts to fix validation errors (if validator.py exists)
     # Sandbox configuration
     sandbox_enabled: bool = True  # Enable macOS sandbox-exec isolation
+    cpu_affinity: bool = False  # Pin evaluator to one core per worker slot (Linux)
     # Retry configuration with exponential backoff
     max_rounds: int = 10
     initial_wait: int = 60
@@ -82,12 +181,27 @@ class Worker:
         self.current_candidate_id: Optional[str] = None
         self._setup_signal_handlers()
 
+        # Prefix for every prompt this worker builds; fixed for the worker's lifetime
+        self._git_warning = get_git_protection_warning()
+
+        # AIDEV-NOTE: validator.py is looked up once per worker. A validator added
+        # mid-run is picked up by the next worker the runner spawns.
+        validator_path = Path(config.evolution_dir) / "validator.py"
+        self._validator_path: Optional[Path] = validator_path if validator_path.exists() else None
+
+        # Core to pin evaluators to, derived from the runner-assigned worker slot
+        self._cpu_core: Optional[int] = None
+        worker_index = os.environ.get('CLAUDE_EVOLVE_WORKER_INDEX')
+        if config.cpu_affinity and worker_index is not None and hasattr(os, 'sched_getaffinity'):
+            allowed = sorted(os.sched_getaffinity(0))
+            self._cpu_core = allowed[int(worker_index) % len(allowed)]
+            log(f"Evaluator CPU affinity: core {self._cpu_core}")
+
         # Initialize LLM bandit for model selection
         # AIDEV-NOTE: Bandit learns which models produce better improvements
         models = get_models_for_command("run")
         if models:
-            bandit_state = os.path.join(config.evolution_dir, "llm_bandit.json")
-            self.bandit = LLMBandit(models, state_file=bandit_state)
+            self.bandit = get_bandit_for_evolution(config.evolution_dir, models)
             log(f"LLM bandit initialized with {len(models)} models")
         else:
             self.bandit = None
@@ -96,27 +210,37 @@ class Worker:
         # Track parent scores for bandit updates
         self._parent_score: Optional[float] = None
         self._model_used: Optional[str] = None
+        # Models that wrote the current candidate's code, recorded as run-LLM
+        self._run_llm_names: List[str] = []
+        # Whether python_cmd can be checked with our own compile() (see _syntax_error)
+        self._same_python: Optional[bool] = None
 
     def _setup_signal_handlers(self):
         """Setup signal handlers for graceful shutdown."""
         signal.signal(signal.SIGTERM, self._handle_signal)
         signal.signal(signal.SIGINT, self._handle_signal)
+        # A hangup would otherwise kill us without unwinding, leaving the
+        # running evaluator's process group/cgroup behind
+        signal.signal(signal.SIGHUP, self._handle_signal)
 
     def _handle_signal(self, signum, frame):
         """Handle termination signal - reset current candidate to pending."""
         sig_name = signal.Signals(signum).name
         log(f"Received {sig_name}")
 
+        # AIDEV-NOTE: Don't rewrite the CSV from a signal handler - a second signal
+        # or hard kill mid-rewrite could corrupt it. Append the ID to the pending
+        # journal instead; the next worker (or runner startup) replays it.
         if self.current_candidate_id:
             log(f"Resetting {self.current_candidate_id} to pending")
             try:
-                with EvolutionCSV(self.config.csv_path) as csv:
-                    info = csv.get_candidate_info(self.current_candidate_id)
-                    status = info.get('status', '').lower() if info else ''
-                    # Don't reset if already complete or permanently failed
-                    if status not in ('complete', 'failed', 'failed-ai-retry', 'failed-parent-missing'):
-                        csv.update_candidate_status(self.current_candidate_id, 'pending')
-            except Exception as e:
+                fd = os.open(self.csv.pending_journal_path, os.O_WRONLY | os.O_CREAT | os.O_APPEND, 0o644)
+                try:
+                    os.write(fd, f"{self.current_candidate_id}\n".encode())
+                    os.fsync(fd)
+                finally:
+                    os.close(fd)
+            except OSError as e:
                 log(f"Error resetting status: {e}")
 
         sys.exit(128 + signum)
@@ -135,7 +259,7 @@ class Worker:
             return None, Path(self.config.algorithm_path)
 
         # Split by comma or space and try each
-        candidates = re.split(r'[,;\s]+', parent_id)
+        candidates = _PARENT_SPLIT_RE.split(parent_id)
         for candidate in candidates:
             candidate = candidate.strip()
             if not candidate:
@@ -155,34 +279,37 @@ class Worker:
 
     def _build_prompt(self, candidate: Candidate, target_basename: str) -> str:
         """Build the AI prompt for code evolution."""
-        return f"""{get_git_protection_warning()}
-
-Modify the algorithm in {target_basename} based on this description: {candidate.description}
-
-The modification should be substantial and follow the description exactly. Make sure the algorithm still follows all interface requirements and can run properly.
-
-Important: Make meaningful changes that match the description. Don't just add comments or make trivial adjustments.
-
-IMPORTANT: If you need to read Python (.py) or CSV files, read them in chunks using offset and limit parameters to avoid context overload
-Example: Read(file_path='evolution_gen01-001.py', offset=0, limit=100) then Read(offset=100, limit=100), etc.
-This is especially important for models with smaller context windows.
-
-CRITICAL: If you do not know how to implement what was asked for, or if the requested change is unclear or not feasible, you MUST refuse to make any changes. DO NOT modify the code if you are uncertain about the implementation. Simply respond that you cannot implement the requested change and explain why. It is better to refuse than to make incorrect or random changes."""
-
-    def _call_ai_with_backoff(self, prompt: str, target_file: Path) -> Tuple[bool, str]:
+        return _BASE_PROMPT_TMPL.format_map({
+            'git_warning': self._git_warning,
+            'target_basename': target_basename,
+            'description': candidate.description,
+        })
+
+    def _call_ai_with_backoff(
+        self,
+        prompt: str,
+        target_file: Path,
+        sig_before: Optional[Tuple[int, int, int]] = None
+    ) -> Tuple[bool, str]:
         """
         Call AI with bandit-based model selection from the primary (cheap) tier.
 
-        AIDEV-NOTE: First tries model selected by UCB bandit.
+        AIDEV-NOTE: First tries model selected by the Thompson-sampling bandit.
         If that fails, retries with round-robin across all primary models.
         The bandit learns which cheap models produce better algorithm improvements.
         Escalation to big models is handled separately on quality failures.
 
+        Args:
+            prompt: Prompt for the AI
+            target_file: File the AI is expected to modify
+            sig_before: Signature of target_file taken right after it was copied
+                        (stat'ed here if not given)
+
         Returns:
             Tuple of (success, model_name)
         """
-        # Get file hash before AI call
-        hash_before = self._file_hash(target_file) if target_file.exists() else None
+        if sig_before is None:
+            sig_before = self._file_sig(target_file)
 
         # Try bandit-selected model first
         if self.bandit:
@@ -196,9 +323,9 @@ CRITICAL: If you do not know how to implement what was asked for, or if the requ
                     working_dir=self.config.evolution_dir
                 )
 
-                hash_after = self._file_hash(target_file) if target_file.exists() else None
+                sig_after = self._file_sig(target_file)
 
-                if hash_before != hash_after and hash_after is not None:
+                if sig_before != sig_after and sig_after is not None:
                     log(f"AI successfully modified file (model: {model})")
                     self._model_used = model  # Track for bandit update
                     return True, model
@@ -229,9 +356,9 @@ CRITICAL: If you do not know how to implement what was asked for, or if the requ
             )
 
             # Check if file was modified
-            hash_after = self._file_hash(target_file) if target_file.exists() else None
+            sig_after = self._file_sig(target_file)
 
-            if hash_before != hash_after and hash_after is not None:
+            if sig_before != sig_after and sig_after is not None:
                 log(f"AI successfully modified file (model: {model})")
                 self._model_used = model  # Track for bandit update
                 return True, model
@@ -258,7 +385,7 @@ CRITICAL: If you do not know how to implement what was asked for, or if the requ
         Returns:
             Tuple of (success, model_name)
         """
-        hash_before = self._file_hash(target_file) if target_file.exists() else None
+        sig_before = self._file_sig(target_file)
 
         try:
             output, model = call_ai_escalation(
@@ -267,9 +394,9 @@ CRITICAL: If you do not know how to implement what was asked for, or if the requ
                 working_dir=self.config.evolution_dir
             )
 
-            hash_after = self._file_hash(target_file) if target_file.exists() else None
+            sig_after = self._file_sig(target_file)
 
-            if hash_before != hash_after and hash_after is not None:
+            if sig_before != sig_after and sig_after is not None:
                 log(f"Escalation AI successfully modified file (model: {model})")
                 return True, model
             else:
@@ -282,35 +409,63 @@ CRITICAL: If you do not know how to implement what was asked for, or if the requ
             log_error(f"All escalation models failed: {e}")
             return False, ""
 
-    def _file_hash(self, path: Path) -> Optional[str]:
-        """Get file hash."""
+    def _file_sig(self, path: Path) -> Optional[Tuple[int, int, int]]:
+        """
+        Get a cheap change signature (inode, size, mtime_ns) from a single stat.
+
+        AIDEV-NOTE: Replaces a full-file sha256 read. AI calls take seconds to
+        minutes, so even coarse mtime resolution moves between the two stats;
+        the inode catches editors that write a temp file and rename over it.
+        """
         try:
-            import hashlib
-            return hashlib.sha256(path.read_bytes()).hexdigest()
-        except Exception:
+            st = path.stat()
+            return st.st_ino, st.st_size, st.st_mtime_ns
+        except OSError:
             return None
 
     def _check_syntax(self, file_path: Path) -> bool:
         """Check Python syntax."""
+        return self._syntax_error(file_path) is None
+
+    def _syntax_error(self, file_path: Path) -> Optional[str]:
+        """
+        Return the file's syntax error text, or None if it compiles.
+
+        AIDEV-NOTE: When python_cmd is this interpreter, or one of the same
+        major.minor version (same grammar), this uses the builtin compile()
+        rather than forking `python -m py_compile`, which paid a full
+        interpreter startup per check (and per escalation retry). Nothing is
+        written to __pycache__. Any other python_cmd is still asked directly,
+        since syntax accepted differs between versions.
+        """
+        if self._same_python is None:
+            self._same_python = _same_python_version(self.config.python_cmd)
+        if not self._same_python:
+            try:
+                result = subprocess.run(
+                    [self.config.python_cmd, "-m", "py_compile", str(file_path)],
+                    capture_output=True,
+                    text=True
+                )
+            except Exception as e:
+                return str(e)
+            return None if result.returncode == 0 else result.stderr.strip()
+
         try:
-            result = subprocess.run(
-                [self.config.python_cmd, "-m", "py_compile", str(file_path)],
-                capture_output=True,
-                text=True
-            )
-            return result.returncode == 0
-        except Exception:
-            return False
+            source = file_path.read_bytes()
+            compile(source, str(file_path), 'exec')
+            return None
+        except (SyntaxError, ValueError) as e:
+            return ''.join(traceback.format_exception_only(type(e), e)).strip()
+        except Exception as e:
+            return str(e)
 
     def _find_validator(self) -> Optional[Path]:
         """
         Auto-detect validator.py in the evolution directory.
         No config required - if validator.py exists, we use it.
         """
-        validator_path = Path(self.config.evolution_dir) / "validator.py"
-        if validator_path.exists():
-            return validator_path
-        return None
+        return self._validator_path
 
     def _run_validator(self, candidate_id: str) -> Tuple[bool, Dict[str, Any]]:
         """
@@ -341,6 +496,19 @@ CRITICAL: If you do not know how to implement what was asked for, or if the requ
                 cwd=self.config.evolution_dir
             )
 
+            # Output is only needed to explain a failure
+            if result.returncode == 0:
+                log("Validation passed")
+                return True, {}
+
+            if not result.stdout and not result.stderr:
+                log_warn(f"Validation failed: exit code {result.returncode}, no output")
+                return False, {
+                    'error_type': 'exit_nonzero',
+                    'error': f"Validator exited with code {result.returncode} and printed nothing",
+                    'returncode': result.returncode
+                }
+
             # Combine stdout and stderr for full context
             stdout = result.stdout.strip() if result.stdout else ""
             stderr = result.stderr.strip() if result.stderr else ""
@@ -362,13 +530,9 @@ CRITICAL: If you do not know how to implement what was asked for, or if the requ
             if 'error' not in error_info and combined_output:
                 error_info['error'] = combined_output
 
-            if result.returncode == 0:
-                log("Validation passed")
-                return True, error_info
-            else:
-                error_type = error_info.get('error_type', 'validation_failed')
-                log_warn(f"Validation failed: {error_type}")
-                return False, error_info
+            error_type = error_info.get('error_type', 'validation_failed')
+            log_warn(f"Validation failed: {error_type}")
+            return False, error_info
 
         except subprocess.TimeoutExpired:
             log_error("Validator timed out")
@@ -383,29 +547,29 @@ CRITICAL: If you do not know how to implement what was asked for, or if the requ
 
         AIDEV-NOTE: Resilient to any error_info structure - uses whatever is available.
         """
-        prompt = f"""{get_git_protection_warning()}
-
-The code in {target_basename} failed validation. Please fix the errors and try again.
+        values = {
+            'git_warning': self._git_warning,
+            'target_basename': target_basename,
+            'description': candidate.description,
+        }
+        parts = [_FIX_PROMPT_HEADER_TMPL.format_map(values)]
 
-## Validator Output
-
-"""
         # Include whatever structured fields we have
         if error_info.get('error_type'):
-            prompt += f"**Error Type:** {error_info['error_type']}\n\n"
+            parts.append(f"**Error Type:** {error_info['error_type']}\n\n")
 
         if error_info.get('error'):
-            prompt += f"**Error:**\n{error_info['error']}\n\n"
+            parts.append(f"**Error:**\n{error_info['error']}\n\n")
 
         if error_info.get('suggestion'):
-            prompt += f"**Suggested Fix:**\n{error_info['suggestion']}\n\n"
+            parts.append(f"**Suggested Fix:**\n{error_info['suggestion']}\n\n")
 
         if error_info.get('traceback'):
             tb = error_info['traceback']
             # Truncate if too long
             if len(tb) > 1500:
                 tb = "..." + tb[-1500:]
-            prompt += f"**Traceback:**\n```\n{tb}\n```\n\n"
+            parts.append(f"**Traceback:**\n```\n{tb}\n```\n\n")
 
         # If we only have raw output (no structured fields), show that
         if not any(error_info.get(k) for k in ('error', 'error_type', 'suggestion', 'traceback')):
@@ -413,24 +577,10 @@ The code in {target_basename} failed validation. Please fix the errors and try a
             # Truncate if needed
             if len(raw) > 2000:
                 raw = raw[:2000] + "\n... (truncated)"
-            prompt += f"```\n{raw}\n```\n\n"
+            parts.append(f"```\n{raw}\n```\n\n")
 
-        prompt += f"""## Instructions
-
-1. Read the file {target_basename} to understand the current code
-2. Identify the issue based on the validator output above
-3. Fix the code to resolve the validation error
-4. The fix should still implement: {candidate.description}
-
-**CRITICAL:** Make sure to actually fix the error. Do not just add comments or make cosmetic changes.
-
-To help debug, you can run the validator yourself:
-```
-python validator.py {target_basename}
-```
-"""
-
-        return prompt
+        parts.append(_FIX_PROMPT_FOOTER_TMPL.format_map(values))
+        return ''.join(parts)
 
     def _run_evaluator(self, candidate_id: str, is_baseline: bool) -> Tuple[Optional[float], Dict[str, Any]]:
         """
@@ -441,6 +591,12 @@ python validator.py {target_basename}
         - Memory limits: kills process if exceeded
         - CPU limits: kernel-enforced time limit
 
+        AIDEV-NOTE: Each evaluation is deliberately a fresh process. A persistent
+        evaluator server would amortize interpreter startup, but the evaluator
+        contract is a CLI (`evaluator.py <id>` printing a score), not an importable
+        API, and the per-run process group is what memory/CPU limits, timeouts
+        and kills apply to. Candidates must not share interpreter state.
+
         Returns:
             Tuple of (score, extra_data_dict) or (None, {}) on failure
         """
@@ -466,21 +622,25 @@ python validator.py {target_basename}
                 memory_mb=self.config.memory_limit_mb,
                 cpu_seconds=self.config.cpu_limit_seconds,
                 timeout_seconds=self.config.timeout_seconds,
-                use_sandbox=use_sandbox
+                use_sandbox=use_sandbox,
+                cpu_core=self._cpu_core
             )
 
             if returncode != 0:
                 log_error(f"Evaluator failed (code {returncode}): {stderr}")
                 return None, {}
 
-            output = stdout + stderr
-            return self._parse_evaluator_output(output)
+            # Prefer stdout so trailing stderr noise can't shadow the result
+            score, json_data = self._parse_evaluator_output(stdout)
+            if score is None and stderr:
+                score, json_data = self._parse_evaluator_output(stdout + stderr)
+            return score, json_data
 
         except Exception as e:
             log_error(f"Evaluator error: {e}")
             return None, {}
 
-    def _parse_evaluator_output(self, output: str) -> Tuple[Optional[float], Dict[str, Any]]:
+    def _parse_evaluator_output(self, output: Union[str, Iterable[str]]) -> Tuple[Optional[float], Dict[str, Any]]:
         """
         Parse evaluator output for score.
 
@@ -488,45 +648,90 @@ python validator.py {target_basename}
         - Simple numeric value
         - JSON with 'performance' or 'score' field
         - SCORE: prefix (legacy)
+
+        AIDEV-NOTE: Single pass over the lines (a string or any iterable of lines),
+        remembering the last JSON result (an object with 'performance' or
+        'score'), the last bare number and the last SCORE: line. Priority
+        afterwards: JSON score, bare number, SCORE:. Evaluators typically print
+        progress and then the result, so last wins - but JSON lines without a
+        score key are logs/diagnostics and never replace a result.
         """
-        score = None
-        json_data = {}
+        lines = output.splitlines() if isinstance(output, str) else output
+        last_json: Optional[Dict[str, Any]] = None
+        last_float: Optional[float] = None
+        last_legacy: Optional[str] = None
 
-        for line in output.strip().split('\n'):
+        for line in lines:
             line = line.strip()
-
-            # Try JSON first
-            if line.startswith('{'):
+            if not line:
+                continue
+            first = line[0]
+            if first == '{':
                 try:
                     data = json.loads(line)
-                    json_data = data
-                    if 'performance' in data:
-                        score = float(data['performance'])
-                    elif 'score' in data:
-                        score = float(data['score'])
-                    break
-                except (json.JSONDecodeError, ValueError):
-                    pass
-
-            # Try simple numeric
-            if score is None and line and not line.startswith('{'):
+                except json.JSONDecodeError:
+                    continue
+                if isinstance(data, dict) and ('performance' in data or 'score' in data):
+                    last_json = data
+            # Only attempt float() on lines that could be one
+            elif first in _NUMERIC_START and line[-1] in _NUMERIC_END:
                 try:
-                    score = float(line)
-                    break
+                    last_float = float(line)
                 except ValueError:
                     pass
+            elif first == 'S':
+                match = _SCORE_RE.match(line)
+                if match:
+                    last_legacy = match.group(1)
 
-        # Try SCORE: prefix (legacy)
-        if score is None:
-            match = re.search(r'^SCORE:\s*([+-]?\d*\.?\d+)', output, re.MULTILINE)
-            if match:
+        score = None
+        json_data = last_json or {}
+
+        # Try JSON first
+        for key in ('performance', 'score'):
+            if key in json_data:
                 try:
-                    score = float(match.group(1))
-                except ValueError:
+                    score = float(json_data[key])
+                except (TypeError, ValueError):
                     pass
+                break
+
+        # Try simple numeric
+        if score is None:
+            score = last_float
+
+        # Try SCORE: prefix (legacy)
+        if score is None and last_legacy is not None:
+            try:
+                score = float(last_legacy)
+            except ValueError:
+                pass
 
         return score, json_data
 
+    def _update_candidate(self, candidate_id: str, fields: Dict[str, str]) -> None:
+        """
+        Write the candidate's outcome fields plus its run-LLM in a single CSV update.
+
+        AIDEV-NOTE: Model names (primary + ESC:escalation) accumulate in
+        self._run_llm_names, so run-LLM is rebuilt from memory instead of being
+        read back from the CSV (get_candidate_info has no run-LLM key).
+        """
+        if self._run_llm_names:
+            fields = {**fields, 'run-LLM': '+'.join(self._run_llm_names)}
+        with EvolutionCSV(self.config.csv_path) as csv:
+            csv.update_candidate_fields(candidate_id, fields)
+
+    def _record_run_llm(self, candidate_id: str, model: str) -> None:
+        """
+        Record a model that wrote the candidate's code, as soon as it's chosen.
+
+        Written immediately rather than with the final status, so a worker that
+        is killed mid-evaluation still leaves behind which models were used.
+        """
+        self._run_llm_names.append(model)
+        self._update_candidate(candidate_id, {})
+
     def process_candidate(self, candidate: Candidate) -> int:
         """
         Process a single candidate.
@@ -537,9 +742,11 @@ python validator.py {target_basename}
         self.current_candidate_id = candidate.id
         self._model_used = None  # Reset for this candidate
         self._parent_score = None
+        self._run_llm_names = []
 
         log(f"Processing: {candidate.id}")
-        log(f"Description: {candidate.description[:80]}..." if len(candidate.description) > 80 else f"Description: {candidate.description}")
+        desc = candidate.description
+        log(f"Description: {desc[:80]}{'...' if len(desc) > 80 else ''}")
         log(f"Based on: {candidate.based_on_id or 'baseline'}")
 
         is_baseline = self._is_baseline(candidate.id, candidate.based_on_id)
@@ -572,11 +779,12 @@ python validator.py {target_basename}
         elif not is_baseline:
             # Copy source to target
             log(f"Copying {source_file.name} to {target_file.name}")
-            shutil.copy(source_file, target_file)
+            _fast_copy(source_file, target_file)
+            copied_sig = self._file_sig(target_file)
 
             # Call AI to modify (uses round-based retry with backoff)
             prompt = self._build_prompt(candidate, target_file.name)
-            success, model = self._call_ai_with_backoff(prompt, target_file)
+            success, model = self._call_ai_with_backoff(prompt, target_file, sig_before=copied_sig)
 
             if not success:
                 log_error("AI failed after all retries")
@@ -585,8 +793,7 @@ python validator.py {target_basename}
 
             # Record model used
             if model:
-                with EvolutionCSV(self.config.csv_path) as csv:
-                    csv.update_candidate_field(candidate.id, 'run-LLM', model)
+                self._record_run_llm(candidate.id, model)
 
             # AIDEV-NOTE: Quality-triggered escalation system.
             # Phase 1: Check syntax from cheap model output
@@ -599,11 +806,7 @@ python validator.py {target_basename}
             if not self._check_syntax(target_file):
                 log("Syntax error from primary model, escalating to big model...")
                 # Get the syntax error details for context
-                syntax_result = subprocess.run(
-                    [self.config.python_cmd, "-m", "py_compile", str(target_file)],
-                    capture_output=True, text=True
-                )
-                syntax_error = syntax_result.stderr.strip()
+                syntax_error = self._syntax_error(target_file) or ''
 
                 fix_prompt = self._build_fix_prompt(
                     candidate, target_file.name,
@@ -614,23 +817,18 @@ python validator.py {target_basename}
                 if not success:
                     log_error("Escalation models failed to fix syntax error")
                     target_file.unlink(missing_ok=True)
-                    with EvolutionCSV(self.config.csv_path) as csv:
-                        csv.update_candidate_status(candidate.id, 'failed-ai-retry')
+                    self._update_candidate(candidate.id, {'status': 'failed-ai-retry'})
                     return 77
 
                 # Record escalation model
                 if fix_model:
-                    with EvolutionCSV(self.config.csv_path) as csv:
-                        current_llm = csv.get_candidate_info(candidate.id).get('run-LLM', '')
-                        new_llm = f"{current_llm}+ESC:{fix_model}" if current_llm else f"ESC:{fix_model}"
-                        csv.update_candidate_field(candidate.id, 'run-LLM', new_llm)
+                    self._record_run_llm(candidate.id, f"ESC:{fix_model}")
 
                 # Re-check syntax after escalation fix
                 if not self._check_syntax(target_file):
                     log_error("Escalation model also produced syntax error — idea too hard")
                     target_file.unlink(missing_ok=True)
-                    with EvolutionCSV(self.config.csv_path) as csv:
-                        csv.update_candidate_status(candidate.id, 'failed-validation')
+                    self._update_candidate(candidate.id, {'status': 'failed-validation'})
                     return 1
 
             # Run validator with escalation on failure
@@ -646,34 +844,28 @@ python validator.py {target_basename}
                 if not success:
                     log_error("Escalation models failed to fix validation error")
                     target_file.unlink(missing_ok=True)
-                    with EvolutionCSV(self.config.csv_path) as csv:
-                        csv.update_candidate_status(candidate.id, 'failed-ai-retry')
+                    self._update_candidate(candidate.id, {'status': 'failed-ai-retry'})
                     return 77
 
                 # Record escalation model
                 if fix_model:
-                    with EvolutionCSV(self.config.csv_path) as csv:
-                        current_llm = csv.get_candidate_info(candidate.id).get('run-LLM', '')
-                        new_llm = f"{current_llm}+ESC:{fix_model}" if current_llm else f"ESC:{fix_model}"
-                        csv.update_candidate_field(candidate.id, 'run-LLM', new_llm)
+                    self._record_run_llm(candidate.id, f"ESC:{fix_model}")
 
                 # Check syntax after escalation fix (escalation might break it)
                 if not self._check_syntax(target_file):
                     log_error("Escalation fix introduced syntax error")
                     target_file.unlink(missing_ok=True)
-                    with EvolutionCSV(self.config.csv_path) as csv:
-                        csv.update_candidate_status(candidate.id, 'failed-validation')
+                    self._update_candidate(candidate.id, {'status': 'failed-validation'})
                     return 1
 
                 # Re-validate after escalation fix
                 valid, error_info = self._run_validator(candidate.id)
                 if not valid:
                     log_error("Validation still fails after escalation — idea too hard")
-                    with EvolutionCSV(self.config.csv_path) as csv:
-                        csv.update_candidate_status(candidate.id, 'failed-validation')
-                        if error_info:
-                            error_summary = f"{error_info.get('error_type', 'unknown')}: {error_info.get('error', '')[:100]}"
-                            csv.update_candidate_field(candidate.id, 'validation_error', error_summary)
+                    fields = {'status': 'failed-validation'}
+                    if error_info:
+                        fields['validation_error'] = f"{error_info.get('error_type', 'unknown')}: {error_info.get('error', '')[:100]}"
+                    self._update_candidate(candidate.id, fields)
                     return 1
 
         # Run evaluator
@@ -682,8 +874,7 @@ python validator.py {target_basename}
 
         if score is None:
             log_error("Evaluation failed - no score")
-            with EvolutionCSV(self.config.csv_path) as csv:
-                csv.update_candidate_status(candidate.id, 'failed')
+            self._update_candidate(candidate.id, {'status': 'failed'})
             # Update bandit with failure
             if self.bandit and self._model_used:
                 self.bandit.update(self._model_used, child_score=None, parent_score=self._parent_score)
@@ -692,15 +883,12 @@ python validator.py {target_basename}
 
         log(f"Score: {score}")
 
-        # Update CSV
-        with EvolutionCSV(self.config.csv_path) as csv:
-            csv.update_candidate_status(candidate.id, 'complete')
-            csv.update_candidate_performance(candidate.id, str(score))
-
-            # Update any extra fields from JSON
-            for key, value in json_data.items():
-                if key not in ('performance', 'score'):
-                    csv.update_candidate_field(candidate.id, key, str(value))
+        # Update CSV - status, performance and any extra JSON fields in one write
+        fields = {'status': 'complete', 'performance': str(score)}
+        for key, value in json_data.items():
+            if key not in ('performance', 'score'):
+                fields[key] = str(value)
+        self._update_candidate(candidate.id, fields)
 
         # Update bandit with improvement data
         # AIDEV-NOTE: This teaches the bandit which models produce better results
@@ -725,6 +913,12 @@ python validator.py {target_basename}
         log(f"Started (max {self.config.max_candidates} candidates)")
         processed = 0
 
+        # Reset candidates left behind by interrupted workers
+        with EvolutionCSV(self.config.csv_path) as csv:
+            replayed = csv.replay_pending_journal()
+        if replayed:
+            log(f"Reset {replayed} interrupted candidates to pending")
+
         while processed < self.config.max_candidates:
             # Get next pending candidate
             with EvolutionCSV(self.config.csv_path) as csv:
@@ -792,20 +986,19 @@ def load_config_from_yaml(config_path: Optional[str] = None) -> Config:
         data = yaml.safe_load(f) or {}
 
     # Resolve paths relative to config file
-    base_dir = yaml_path.parent
+    # AIDEV-NOTE: Only the base directory is canonicalized (one resolve());
+    # the per-field paths are joined and normalized lexically without stats.
+    base_dir = yaml_path.parent.resolve()
 
     def resolve(path: str) -> str:
-        p = Path(path)
-        if not p.is_absolute():
-            p = base_dir / p
-        return str(p.resolve())
+        return os.path.normpath(base_dir / path)
 
     ideation = data.get('ideation', {})
     sandbox = data.get('sandbox', {})
 
     return Config(
         csv_path=resolve(data.get('csv_file', 'evolution.csv')),
-        evolution_dir=str(base_dir.resolve()),
+        evolution_dir=str(base_dir),
         output_dir=resolve(data.get('output_dir', '.')),
         algorithm_path=resolve(data.get('algorithm_file', 'algorithm.py')),
         evaluator_path=resolve(data.get('evaluator_file', 'evaluator.py')),
@@ -817,6 +1010,7 @@ def load_config_from_yaml(config_path: Optional[str] = None) -> Config:
         max_candidates=data.get('worker_max_candidates', 5),
         max_validation_retries=data.get('max_validation_retries', 3),
         sandbox_enabled=sandbox.get('enabled', True),
+        cpu_affinity=sandbox.get('cpu_affinity', False),
         max_rounds=ideation.get('max_rounds', 10),
         initial_wait=ideation.get('initial_wait', 60),
         max_wait=ideation.get('max_wait', 600)
@@ -849,7 +1043,6 @@ def main():
         sys.exit(1)
     except Exception as e:
         log_error(f"Error: {e}")
-        import traceback
         traceback.print_exc()
         sys.exit(1)
 
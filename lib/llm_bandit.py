@@ -1,105 +1,214 @@
 #!/usr/bin/env python3
 """
-UCB-based Multi-Armed Bandit for LLM model selection.
+Thompson-sampling Multi-Armed Bandit for LLM model selection.
 
 AIDEV-NOTE: This module tracks which LLM models produce the best algorithm
-improvements and uses UCB1 to select models, balancing exploitation
+improvements and uses Thompson sampling to select models, balancing exploitation
 (using models that historically perform well) with exploration
-(trying models that haven't been used much).
+(models with few or noisy observations get wide samples and win sometimes).
+UCB1-Tuned scores are still computed, but only for print_summary.
 
 The key insight is: we track the IMPROVEMENT each model produces,
 not the absolute score. improvement = child_score - parent_score.
 This normalizes across different problem difficulties.
 """
 
+import atexit
 import json
 import math
 import os
 import random
 import sys
+import threading
+import time
+from collections import deque
 from dataclasses import dataclass, field
-from datetime import datetime
 from pathlib import Path
-from typing import Dict, List, Optional, Tuple
+from typing import Deque, Dict, List, Optional, Tuple
+
+SCRIPT_DIR = Path(__file__).parent
+if str(SCRIPT_DIR.parent) not in sys.path:
+    sys.path.insert(0, str(SCRIPT_DIR.parent))
+
+from lib.log import log, log_error
+
+# Number of recent improvements per model that the estimates are based on
+WINDOW_SIZE = 50
 
 
 @dataclass
 class ModelStats:
     """Statistics for a single model."""
     name: str
-    n_completed: int = 0  # Times this model completed successfully
+    n_completed: int = 0  # Times this model completed (lifetime, never decays)
     n_submitted: int = 0  # Times this model was selected
-    total_improvement: float = 0.0  # Sum of (child_score - parent_score)
+    # Most recent (child_score - parent_score) values, oldest first.
+    # Modify only through add()/reset() so the running sums stay in step.
+    recent: Deque[float] = field(default_factory=lambda: deque(maxlen=WINDOW_SIZE))
+    # AIDEV-NOTE: Running window sums make mean/variance O(1) instead of a pass
+    # over the deque on every Thompson sample. They are recomputed exactly each
+    # time the window turns over, so add/subtract rounding can't accumulate.
+    total_improvement: float = field(default=0.0, repr=False)  # Sum over the window
+    sum_sq_improvement: float = field(default=0.0, repr=False)  # Sum of squares over the window
+    _adds_since_resum: int = field(default=0, repr=False)
+
+    def add(self, improvement: float) -> None:
+        """Push an improvement into the window, evicting the oldest if full."""
+        recent = self.recent
+        if len(recent) == recent.maxlen:
+            old = recent[0]
+            self.total_improvement -= old
+            self.sum_sq_improvement -= old * old
+        recent.append(improvement)
+        self.total_improvement += improvement
+        self.sum_sq_improvement += improvement * improvement
+
+        self._adds_since_resum += 1
+        if self._adds_since_resum >= (recent.maxlen or len(recent)):
+            self.reset(list(recent))
+
+    def reset(self, improvements: List[float]) -> None:
+        """Replace the window contents and recompute the sums."""
+        self.recent.clear()
+        self.recent.extend(improvements)
+        self.total_improvement = sum(self.recent)
+        self.sum_sq_improvement = sum(x * x for x in self.recent)
+        self._adds_since_resum = 0
+
+    @property
+    def n_recent(self) -> int:
+        """Number of observations in the window."""
+        return len(self.recent)
 
     @property
     def mean_improvement(self) -> float:
-        """Average improvement per completion."""
-        if self.n_completed == 0:
+        """Average improvement over the window."""
+        if not self.recent:
             return 0.0
-        return self.total_improvement / self.n_completed
+        return self.total_improvement / len(self.recent)
+
+    @property
+    def variance(self) -> float:
+        """Observed variance of improvements (0 with fewer than two observations)."""
+        n = len(self.recent)
+        if n < 2:
+            return 0.0
+        mean = self.mean_improvement
+        return max(0.0, self.sum_sq_improvement / n - mean * mean)
 
 
 class LLMBandit:
     """
-    UCB1-based bandit for LLM model selection.
+    Thompson-sampling bandit for LLM model selection.
 
     Tracks which models produce the best improvements and selects
-    models using Upper Confidence Bound algorithm.
+    models by sampling a plausible mean improvement for each and
+    taking the best sample.
 
-    Formula: UCB = mean_improvement + c * sqrt(ln(N) / n_i)
+    Sample: theta_i ~ Normal(mean_i, sigma_i / sqrt(n_i + 1))
 
     Where:
-    - mean_improvement: average (child_score - parent_score) for this model
-    - c: exploration coefficient (default 1.0)
-    - N: total number of completions across all models
-    - n_i: number of completions for this model
+    - mean_i: average (child_score - parent_score) for this model
+    - sigma_i: observed std dev of this model's improvements
+               (pooled across all models until it has two observations)
+    - n_i: number of this model's observations in the sliding window
+
+    The UCB1-Tuned score is reported by print_summary as a confidence-adjusted
+    ranking:
+
+    UCB = mean_i + c * sqrt(ln(N) / n_i * min(1/4, var_i + sqrt(2 ln(N) / n_i)))
+
+    Low-variance models get a smaller exploration bonus than under plain UCB1.
     """
 
     def __init__(
         self,
         model_names: List[str],
         exploration_coef: float = 1.0,
-        epsilon: float = 0.15,
+        epsilon: float = 0.0,
         decay_factor: float = 0.95,
-        state_file: Optional[str] = None
+        state_file: Optional[str] = None,
+        window_size: int = WINDOW_SIZE
     ):
         """
         Initialize the bandit.
 
         Args:
             model_names: List of available model names
-            exploration_coef: UCB exploration coefficient (c)
-            epsilon: Probability of random exploration
-            decay_factor: Factor to decay old observations (0-1)
+            exploration_coef: UCB exploration coefficient (c), used for the summary
+            epsilon: Unused; kept for state-file and API compatibility
+            decay_factor: Unused; kept for state-file and API compatibility
             state_file: Path to persist state (optional)
+            window_size: Number of recent improvements kept per model
         """
         self.exploration_coef = exploration_coef
         self.epsilon = epsilon
         self.decay_factor = decay_factor
         self.state_file = state_file
+        # AIDEV-NOTE: Old observations age out of a fixed-size window per model
+        # rather than being decayed. Multiplicative decay shrank sums and counts
+        # separately (with int() truncation on the count), which skewed the means.
+        self.window_size = window_size
+
+        # Per-selection/update tracing is only useful when debugging
+        self._debug = bool(os.environ.get('DEBUG') or os.environ.get('VERBOSE'))
+
+        # Serializes the flush timer's save() with model registration
+        self._lock = threading.RLock()
 
         # Initialize stats for each model
-        self.models: Dict[str, ModelStats] = {
-            name: ModelStats(name=name) for name in model_names
-        }
+        # AIDEV-NOTE: Add models only via _add_model so the cached candidate
+        # tuple and untried set (used by select_model) stay in sync.
+        self.models: Dict[str, ModelStats] = {}
+        self._all_candidates: Tuple[str, ...] = ()
+        self._untried: set = set()
+        for name in model_names:
+            self._add_model(name)
 
         # Baseline score for normalizing improvements
         self._baseline_score: float = 0.0
 
-        # AIDEV-NOTE: Decay counter - only apply decay every N updates to prevent
-        # aggressive memory loss. With decay_factor=0.95 applied every update,
-        # n_completed floors at 1 after ~50 updates and the bandit can't learn.
-        self._updates_since_decay: int = 0
-        self._decay_interval: int = 50  # Apply decay every 50 updates
+        # AIDEV-NOTE: update() only marks state dirty; the file is rewritten at most
+        # every _save_interval seconds, plus once at interpreter exit (atexit also
+        # runs on the worker's signal-handler sys.exit). Updates that land inside
+        # the interval are flushed together by a one-shot timer, so other workers
+        # see them within _save_interval even if this worker then spends minutes
+        # in an evaluation. A SIGKILL can lose the last few seconds of updates,
+        # which the bandit tolerates.
+        self._dirty: bool = False
+        self._last_save_ts: float = 0.0
+        self._save_interval: float = 5.0
+        self._flush_timer: Optional[threading.Timer] = None
 
         # Load existing state if available
         if state_file and Path(state_file).exists():
             self.load()
 
+        if state_file:
+            atexit.register(self.close)
+
     def set_baseline(self, score: float) -> None:
         """Set baseline score (typically the best score at start)."""
         self._baseline_score = score
 
+    def _new_stats(self, name: str) -> ModelStats:
+        return ModelStats(name=name, recent=deque(maxlen=self.window_size))
+
+    def _add_model(self, name: str) -> ModelStats:
+        """Register a model (no-op if known) and return its stats."""
+        stats = self.models.get(name)
+        if stats is None:
+            with self._lock:
+                stats = self.models[name] = self._new_stats(name)
+                self._all_candidates += (name,)
+                self._untried.add(name)
+        return stats
+
+    @property
+    def total_recent(self) -> int:
+        """Total observations across all models' windows."""
+        return sum(m.n_recent for m in self.models.values())
+
     @property
     def total_completions(self) -> int:
         """Total number of completed evaluations across all models."""
@@ -107,28 +216,67 @@ class LLMBandit:
 
     def _ucb_score(self, stats: ModelStats) -> float:
         """
-        Calculate UCB score for a model.
+        Calculate UCB1-Tuned score for a model.
 
         Returns high value for:
         - Models with high mean improvement
-        - Models that haven't been tried much (exploration bonus)
+        - Models that haven't been tried much, scaled down when their
+          improvements have been consistent (low variance)
         """
-        n_total = max(self.total_completions, 1)
-        n_model = max(stats.n_completed, 1)
+        return self._ucb_tuned(stats, math.log(max(self.total_recent, 1)))
 
-        # Mean improvement (can be negative)
-        mean = stats.mean_improvement
+    def _ucb_tuned(self, stats: ModelStats, log_n: float) -> float:
+        """UCB1-Tuned score given ln(total completions)."""
+        n_model = max(stats.n_recent, 1)
+        ratio = log_n / n_model
+        # Variance upper bound, capped at 1/4 (the max variance of a [0,1] reward)
+        v = min(0.25, stats.variance + math.sqrt(2 * ratio))
+        return stats.mean_improvement + self.exploration_coef * math.sqrt(ratio * v)
 
-        # Exploration bonus
-        exploration = self.exploration_coef * math.sqrt(
-            2 * math.log(n_total) / n_model
-        )
+    def _ucb_scores(self) -> Dict[str, float]:
+        """
+        UCB scores for every model in one pass.
 
-        return mean + exploration
+        Same formula as _ucb_score, with ln(N) computed once rather than per model.
+        """
+        log_n = math.log(max(self.total_recent, 1))
+        return {name: self._ucb_tuned(stats, log_n) for name, stats in self.models.items()}
+
+    def _pooled_sigma(self) -> float:
+        """Std dev of improvements across all models; fallback for models with <2 samples."""
+        n = 0
+        total = 0.0
+        total_sq = 0.0
+        for m in self.models.values():
+            n += len(m.recent)
+            total += m.total_improvement
+            total_sq += m.sum_sq_improvement
+        if n < 2:
+            return 1.0
+        mean = total / n
+        var = total_sq / n - mean * mean
+        return math.sqrt(var) if var > 0 else 1.0
+
+    @staticmethod
+    def _thompson_sample(stats: ModelStats, pooled_sigma: float,
+                         _gauss=random.gauss, _sqrt=math.sqrt) -> float:
+        """
+        Draw a plausible mean improvement for a model.
+
+        Reads the running sums directly (one len(), no property chain) since
+        this runs once per candidate on every selection.
+        """
+        n = len(stats.recent)
+        if n == 0:
+            return _gauss(0.0, pooled_sigma)
+        mean = stats.total_improvement / n
+        var = stats.sum_sq_improvement / n - mean * mean if n >= 2 else 0.0
+        sigma = _sqrt(var) if var > 0 else pooled_sigma
+        return _gauss(mean, sigma / _sqrt(n + 1))
 
     def select_model(self, available_models: Optional[List[str]] = None) -> str:
         """
-        Select a model using UCB with epsilon-greedy exploration.
+        Select a model using Thompson sampling.
 
         Args:
             available_models: Subset of models to choose from (optional)
@@ -137,33 +285,33 @@ class LLMBandit:
             Selected model name
         """
         if available_models is None:
-            available_models = list(self.models.keys())
-
-        # Filter to only available models
-        candidates = [m for m in available_models if m in self.models]
-        if not candidates:
-            # Unknown models - add them and return random one
-            for m in available_models:
-                if m not in self.models:
-                    self.models[m] = ModelStats(name=m)
-            candidates = available_models
-
-        # Epsilon-greedy: sometimes explore randomly
-        if random.random() < self.epsilon:
-            selected = random.choice(candidates)
-            self._log(f"Exploration: randomly selected {selected}")
+            candidates = self._all_candidates
+            unused = self._untried
+        else:
+            # Filter to only available models
+            candidates = [m for m in available_models if m in self.models]
+            if not candidates:
+                # Unknown models - add them and return random one
+                for m in available_models:
+                    self._add_model(m)
+                candidates = available_models
+            unused = self._untried.intersection(candidates)
+
+        # First try models that haven't been used
+        if unused:
+            selected = random.choice(tuple(unused))
+            self._log(f"Thompson: selected untried model {selected}")
         else:
-            # UCB selection
-            # First try models that haven't been used
-            unused = [m for m in candidates if self.models[m].n_completed == 0]
-            if unused:
-                selected = random.choice(unused)
-                self._log(f"UCB: selected untried model {selected}")
-            else:
-                # Select by highest UCB score
-                scores = {m: self._ucb_score(self.models[m]) for m in candidates}
-                selected = max(scores, key=scores.get)
-                self._log(f"UCB: selected {selected} (score={scores[selected]:.4f})")
+            # Select by highest sampled mean improvement
+            pooled_sigma = self._pooled_sigma()
+            models = self.models
+            selected = None
+            best = -math.inf
+            for m in candidates:
+                sample = self._thompson_sample(models[m], pooled_sigma)
+                if sample > best:
+                    selected, best = m, sample
+            self._log(f"Thompson: selected {selected} (sample={best:.4f})")
 
         # Track submission
         self.models[selected].n_submitted += 1
@@ -187,20 +335,17 @@ class LLMBandit:
         Returns:
             The improvement value (0 if failed or no comparison)
         """
-        if model_name not in self.models:
-            self.models[model_name] = ModelStats(name=model_name)
-
-        stats = self.models[model_name]
+        stats = self._add_model(model_name)
+        self._untried.discard(model_name)
 
         # Failed evaluation
         if child_score is None:
             stats.n_completed += 1
             # Count failures as slight negative improvement
             improvement = -0.1
-            stats.total_improvement += improvement
+            stats.add(improvement)
             self._log(f"Update {model_name}: failed (imp={improvement:.4f})")
-            self._apply_decay()
-            self.save()
+            self._save_debounced()
             return improvement
 
         # Calculate improvement
@@ -211,38 +356,51 @@ class LLMBandit:
             improvement = child_score - self._baseline_score
 
         stats.n_completed += 1
-        stats.total_improvement += improvement
+        stats.add(improvement)
 
         self._log(f"Update {model_name}: imp={improvement:.4f}, mean={stats.mean_improvement:.4f}")
 
-        self._apply_decay()
-        self.save()
+        self._save_debounced()
 
         return improvement
 
-    def _apply_decay(self) -> None:
-        """Apply decay to reduce influence of old observations.
-
-        AIDEV-NOTE: Only applies every _decay_interval updates to prevent
-        aggressive memory loss. The int() truncation on n_completed was
-        destroying the bandit's ability to learn from failures.
-        """
-        self._updates_since_decay += 1
-        if self._updates_since_decay < self._decay_interval:
+    def _save_debounced(self) -> None:
+        """Mark state dirty; save now if the last save is old enough, else schedule a flush."""
+        self._dirty = True
+        if not self.state_file:
             return
-
-        self._updates_since_decay = 0
-        for stats in self.models.values():
-            # Decay totals to reduce influence of old observations
-            stats.total_improvement *= self.decay_factor
-            # Decay counts but preserve enough memory to differentiate models
-            if stats.n_completed > 2:
-                stats.n_completed = max(2, int(stats.n_completed * self.decay_factor))
+        elapsed = time.monotonic() - self._last_save_ts
+        if elapsed >= self._save_interval:
+            self.save()
+        elif self._flush_timer is None:
+            timer = threading.Timer(self._save_interval - elapsed, self._timer_flush)
+            timer.daemon = True
+            self._flush_timer = timer
+            timer.start()
+
+    def _timer_flush(self) -> None:
+        with self._lock:
+            self._flush_timer = None
+            if self._dirty:
+                self.save()
+
+    def close(self) -> None:
+        """Flush any unsaved updates to the state file."""
+        with self._lock:
+            if self._flush_timer is not None:
+                self._flush_timer.cancel()
+                self._flush_timer = None
+            if self._dirty:
+                self.save()
 
     def save(self) -> None:
-        """Persist state to file."""
+        """Persist state to file (atomically, via temp file + rename)."""
         if not self.state_file:
             return
+        with self._lock:
+            self._save_locked()
+
+    def _save_locked(self) -> None:
 
         data = {
             'exploration_coef': self.exploration_coef,
@@ -253,19 +411,28 @@ class LLMBandit:
                 name: {
                     'n_completed': stats.n_completed,
                     'n_submitted': stats.n_submitted,
-                    'total_improvement': stats.total_improvement
+                    'recent': list(stats.recent)
                 }
                 for name, stats in self.models.items()
             },
-            'updated_at': datetime.now().isoformat()
+            'updated_at': time.strftime('%Y-%m-%dT%H:%M:%S')
         }
 
+        # Per-process temp name: several workers share one state file
+        tmp_path = f"{self.state_file}.tmp.{os.getpid()}"
         try:
             Path(self.state_file).parent.mkdir(parents=True, exist_ok=True)
-            with open(self.state_file, 'w') as f:
-                json.dump(data, f, indent=2)
+            with open(tmp_path, 'w') as f:
+                json.dump(data, f, separators=(',', ':'))
+            os.replace(tmp_path, self.state_file)
+            self._dirty = False
+            self._last_save_ts = time.monotonic()
         except Exception as e:
-            self._log(f"Failed to save bandit state: {e}")
+            log_error(f"Failed to save bandit state: {e}", prefix="BANDIT")
+            try:
+                os.unlink(tmp_path)
+            except OSError:
+                pass
 
     def load(self) -> bool:
         """Load state from file."""
@@ -282,44 +449,51 @@ class LLMBandit:
             self._baseline_score = data.get('baseline_score', 0.0)
 
             for name, stats_data in data.get('models', {}).items():
-                if name in self.models:
-                    self.models[name].n_completed = stats_data.get('n_completed', 0)
-                    self.models[name].n_submitted = stats_data.get('n_submitted', 0)
-                    self.models[name].total_improvement = stats_data.get('total_improvement', 0.0)
+                n_completed = stats_data.get('n_completed', 0)
+                recent = stats_data.get('recent')
+                if recent is None:
+                    # Older state files only have decayed totals; seed the window
+                    # with their mean (zero variance) so the estimate carries over
+                    n = min(n_completed, self.window_size)
+                    recent = [stats_data.get('total_improvement', 0.0) / n_completed] * n if n else []
+
+                stats = self._add_model(name)
+                stats.n_completed = n_completed
+                stats.n_submitted = stats_data.get('n_submitted', 0)
+                stats.reset(recent)
+                if n_completed:
+                    self._untried.discard(name)
                 else:
-                    self.models[name] = ModelStats(
-                        name=name,
-                        n_completed=stats_data.get('n_completed', 0),
-                        n_submitted=stats_data.get('n_submitted', 0),
-                        total_improvement=stats_data.get('total_improvement', 0.0)
-                    )
+                    self._untried.add(name)
 
             self._log(f"Loaded bandit state: {len(self.models)} models, {self.total_completions} completions")
             return True
 
         except Exception as e:
-            self._log(f"Failed to load bandit state: {e}")
+            log_error(f"Failed to load bandit state: {e}", prefix="BANDIT")
             return False
 
     def print_summary(self) -> None:
-        """Print a summary of model performance."""
+        """Print a summary of model performance (flushing pending state first)."""
+        self.close()
         print("\n=== LLM Bandit Summary ===", file=sys.stderr)
         print(f"Total completions: {self.total_completions}", file=sys.stderr)
-        print(f"Exploration coef: {self.exploration_coef}, epsilon: {self.epsilon}", file=sys.stderr)
+        print(f"Exploration coef: {self.exploration_coef} (UCB column only)", file=sys.stderr)
         print(f"Baseline score: {self._baseline_score:.4f}", file=sys.stderr)
         print("-" * 60, file=sys.stderr)
         print(f"{'Model':<25} {'N':>5} {'Mean Imp':>10} {'UCB':>10}", file=sys.stderr)
         print("-" * 60, file=sys.stderr)
 
-        # Sort by UCB score
+        # Sort by UCB score (each score computed once)
+        scores = self._ucb_scores()
         sorted_models = sorted(
             self.models.values(),
-            key=lambda m: self._ucb_score(m),
+            key=lambda m: scores[m.name],
             reverse=True
         )
 
         for stats in sorted_models:
-            ucb = self._ucb_score(stats)
+            ucb = scores[stats.name]
             print(
                 f"{stats.name:<25} {stats.n_completed:>5} "
                 f"{stats.mean_improvement:>10.4f} {ucb:>10.4f}",
@@ -329,9 +503,9 @@ class LLMBandit:
         print("=" * 60, file=sys.stderr)
 
     def _log(self, msg: str) -> None:
-        """Log message to stderr."""
-        ts = datetime.now().strftime("%H:%M:%S")
-        print(f"[{ts}] [BANDIT] {msg}", file=sys.stderr, flush=True)
+        """Log a trace message to stderr (only if DEBUG or VERBOSE is set)."""
+        if self._debug:
+            log(msg, prefix="BANDIT")
 
 
 def get_bandit_for_evolution(evolution_dir: str, models: List[str]) -> LLMBandit:
@@ -1,7 +1,8 @@
 #!/usr/bin/env python3
 """
 Simple timestamped logging for claude-evolve.
-Uses stderr with flush=True for real-time output.
+Writes each line to stderr with a single unbuffered os.write for real-time
+output (set LOG_PYTHON_PRINT=1 to use print(..., flush=True) instead).
 Also writes to a log file if configured.
 
 AIDEV-NOTE: Set CLAUDE_EVOLVE_LOG_DIR or call init_file_logging() to enable file logging.
@@ -9,6 +10,7 @@ AIDEV-NOTE: Set CLAUDE_EVOLVE_LOG_DIR or call init_file_logging() to enable file
 
 import os
 import sys
+import time
 from datetime import datetime
 from pathlib import Path
 from typing import Optional
@@ -16,6 +18,38 @@ from typing import Optional
 # Default prefix, can be set per-module
 _prefix = "EVOLVE"
 
+# AIDEV-NOTE: log() runs on every worker/coordinator step, so the pid and the
+# "[PREFIX-pid]" tag are cached (refreshed after fork), and timestamps are only
+# re-formatted when the wall-clock second changes.
+_pid = os.getpid()
+_tag = f"[{_prefix}-{_pid}]"
+_ts_sec = -1
+_ts_short = ""
+_ts_full = ""
+
+_use_print = bool(os.environ.get('LOG_PYTHON_PRINT'))
+
+
+def _refresh_pid():
+    global _pid, _tag
+    _pid = os.getpid()
+    _tag = f"[{_prefix}-{_pid}]"
+
+
+if hasattr(os, 'register_at_fork'):
+    os.register_at_fork(after_in_child=_refresh_pid)
+
+
+def _timestamps():
+    """Return (HH:MM:SS, YYYY-mm-dd HH:MM:SS) for now, cached per second."""
+    global _ts_sec, _ts_short, _ts_full
+    now = int(time.time())
+    if now != _ts_sec:
+        _ts_full = time.strftime("%Y-%m-%d %H:%M:%S", time.localtime(now))
+        _ts_short = _ts_full[11:]
+        _ts_sec = now
+    return _ts_short, _ts_full
+
 # File logging
 _log_file = None
 _log_dir = None
@@ -25,6 +59,7 @@ def set_prefix(prefix: str):
     """Set the log prefix (e.g., 'WORKER', 'IDEATE', 'RUN')."""
     global _prefix
     _prefix = prefix
+    _refresh_pid()
 
 
 def init_file_logging(log_dir: Optional[str] = None):
@@ -71,19 +106,30 @@ def _write_to_file(msg: str):
             pass  # Don't fail on log write errors
 
 
+def _write_console(line: str):
+    """Write one line to stderr in a single syscall (no stream lock or flush)."""
+    if _use_print:
+        print(line, file=sys.stderr, flush=True)
+        return
+    data = (line + "\n").encode('utf-8', 'backslashreplace')
+    try:
+        while data:
+            data = data[os.write(2, data):]
+    except OSError:
+        pass  # stderr closed; nothing useful to do
+
+
 def log(msg: str, prefix: str = None):
     """Log with timestamp. Always flushes for real-time output."""
-    ts = datetime.now().strftime("%H:%M:%S")
-    date_ts = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
-    p = prefix or _prefix
-    pid = os.getpid()
+    ts, date_ts = _timestamps()
+    tag = f"[{prefix}-{_pid}]" if prefix else _tag
 
     # Console output (short timestamp)
-    console_msg = f"[{ts}] [{p}-{pid}] {msg}"
-    print(console_msg, file=sys.stderr, flush=True)
+    console_msg = f"[{ts}] {tag} {msg}"
+    _write_console(console_msg)
 
     # File output (full timestamp)
-    file_msg = f"[{date_ts}] [{p}-{pid}] {msg}"
+    file_msg = f"[{date_ts}] {tag} {msg}"
     _write_to_file(file_msg)
 
 
@@ -16,20 +16,100 @@ This is a simpler approach than full meta-summarization - just accumulating
 notes about what works.
 """
 
+import functools
+import json
+import mmap
 import os
+import re
 import sys
+from concurrent.futures import ThreadPoolExecutor
 from dataclasses import dataclass
 from datetime import datetime
 from pathlib import Path
 from typing import List, Dict, Optional, Tuple
 
 SCRIPT_DIR = Path(__file__).parent
-sys.path.insert(0, str(SCRIPT_DIR.parent))
+if str(SCRIPT_DIR.parent) not in sys.path:
+    sys.path.insert(0, str(SCRIPT_DIR.parent))
 
-from lib.evolution_csv import EvolutionCSV
-from lib.ai_cli import call_ai_with_backoff, AIError
+from lib.evolution_csv import EvolutionCSV, parse_generation
+from lib.ai_cli import call_ai_with_backoff, cancel_ai_calls, AIError
 from lib.log import log, log_error, log_warn
 
+# "## Generation N" headers in BRIEF-notes.md, matched on raw bytes
+_GEN_RE = re.compile(rb'## Generation (\d+)')
+
+# Characters hand-edited rows may leave around an ID (csv.reader already unquotes)
+_ID_PAD = ' \t\r\n"'
+
+# Row statuses that mean a generation is still in progress
+_STATUS_PENDING = frozenset({'pending', 'running', ''})
+
+# Concurrent AI calls when catching up on several generations at once
+MAX_PARALLEL_GENERATIONS = 4
+
+# Generations summarized per AI call when catching up (bounds prompt size)
+MAX_BATCH_GENERATIONS = 8
+
+_TASK_INSTRUCTIONS = """1. What approaches WORKED (led to improvement)
+2. What approaches FAILED (led to regression)
+3. Any patterns you notice
+
+Be specific about the algorithmic techniques, not just generic observations."""
+
+
+def _clean_id(value: str) -> str:
+    """Strip stray whitespace/quotes from a CSV ID field, without copying clean ones."""
+    if value[:1] in _ID_PAD or value[-1:] in _ID_PAD:
+        return value.strip().strip('"')
+    return value
+
+
+@dataclass
+class _CsvIndex:
+    """One parse of evolution.csv, grouped for per-generation analysis."""
+    perf_by_id: Dict[str, str]  # First occurrence wins (matches get_candidate_info)
+    rows_by_gen: Dict[int, List[List[str]]]
+    highest_gen: int
+
+
+@functools.lru_cache(maxsize=1)
+def _load_csv_index(csv_path: str, stamp: Tuple[int, int, int]) -> _CsvIndex:
+    """Read and index the CSV. stamp only keys the cache; see _csv_index."""
+    with EvolutionCSV(csv_path) as csv:
+        rows = csv._read_csv()
+
+    has_header = rows and rows[0] and rows[0][0].lower() == 'id'
+    start_idx = 1 if has_header else 0
+
+    perf_by_id: Dict[str, str] = {}
+    rows_by_gen: Dict[int, List[List[str]]] = {}
+    for row in rows[start_idx:]:
+        if not row or not row[0].strip():
+            continue
+        perf_by_id.setdefault(_clean_id(row[0]), row[3] if len(row) > 3 else '')
+        gen = parse_generation(row[0])
+        if gen is not None:
+            rows_by_gen.setdefault(gen, []).append(row)
+
+    return _CsvIndex(perf_by_id, rows_by_gen, max(rows_by_gen, default=0))
+
+
+def _csv_index(csv_path: str) -> Optional[_CsvIndex]:
+    """
+    Return the row index for csv_path, or None if the file doesn't exist.
+
+    AIDEV-NOTE: Cached on (inode, mtime_ns, size). EvolutionCSV rewrites the
+    file via rename, so any write changes the key and forces a reread, while
+    process_new_generations and every analyze_generation call it makes share
+    one parse instead of each scanning the whole CSV.
+    """
+    try:
+        st = os.stat(csv_path)
+    except FileNotFoundError:
+        return None
+    return _load_csv_index(csv_path, (st.st_ino, st.st_mtime_ns, st.st_size))
+
 
 @dataclass
 class GenerationSummary:
@@ -59,55 +139,49 @@ def analyze_generation(csv_path: str, generation: int) -> Optional[GenerationSum
     """
     gen_prefix = f"gen{generation:02d}-"
 
-    with EvolutionCSV(csv_path) as csv:
-        rows = csv._read_csv()
-
-    if not rows:
+    index = _csv_index(csv_path)
+    if not index:
         return None
-
-    has_header = rows and rows[0] and rows[0][0].lower() == 'id'
-    start_idx = 1 if has_header else 0
+    perf_by_id = index.perf_by_id
 
     algorithms = []
     pending_count = 0
 
-    for row in rows[start_idx:]:
+    for row in index.rows_by_gen.get(generation, ()):
         if len(row) < 5:
             continue
 
-        candidate_id = row[0].strip().strip('"')
+        candidate_id, parent_id, description, performance_str, status = row[:5]
+        candidate_id = _clean_id(candidate_id)
         if not candidate_id.startswith(gen_prefix):
             continue
 
-        status = row[4].strip().lower() if row[4] else ''
-
-        # Skip if still pending
-        if status in ('pending', 'running', ''):
-            pending_count += 1
-            continue
-
+        # Complete rows are the common case in a finished generation; anything
+        # else is skipped, counting those still pending
         if status != 'complete':
-            continue
+            status = status.strip().lower()
+            if status != 'complete':
+                pending_count += status in _STATUS_PENDING
+                continue
 
-        performance_str = row[3].strip() if len(row) > 3 else ''
+        # float() ignores surrounding whitespace itself
         try:
             performance = float(performance_str)
         except ValueError:
             continue
 
-        parent_id = row[1].strip() if len(row) > 1 else ''
-        description = row[2].strip() if len(row) > 2 else ''
+        parent_id = _clean_id(parent_id)
+        description = description.strip()
 
         # Get parent's score
         parent_score = 0.0
         if parent_id:
-            with EvolutionCSV(csv_path) as csv:
-                parent_info = csv.get_candidate_info(parent_id)
-                if parent_info and parent_info.get('performance'):
-                    try:
-                        parent_score = float(parent_info['performance'])
-                    except ValueError:
-                        pass
+            parent_score_str = perf_by_id.get(parent_id, '')
+            if parent_score_str.strip():
+                try:
+                    parent_score = float(parent_score_str)
+                except ValueError:
+                    pass
 
         improvement = performance - parent_score
 
@@ -148,6 +222,35 @@ def analyze_generation(csv_path: str, generation: int) -> Optional[GenerationSum
     )
 
 
+def _generation_results(summary: GenerationSummary) -> str:
+    """Format a generation's results and top algorithms for a notes prompt."""
+    # Build algorithm summary for prompt
+    algo_summaries = []
+    for algo in summary.algorithms[:10]:  # Top 10 only to limit context
+        status = "improved" if algo['improvement'] > 0 else "regressed"
+        algo_summaries.append(
+            f"- {algo['id']}: {algo['description'][:100]}... "
+            f"(improvement: {algo['improvement']:+.4f}, {status})"
+        )
+
+    return f"""## Generation {summary.generation} Results
+- Total algorithms: {summary.total_algorithms}
+- Improved over parent: {summary.successful}
+- Regressed from parent: {summary.failed}
+- Best improvement: {summary.best_improvement:+.4f} ({summary.best_id})
+- Worst: {summary.worst_improvement:+.4f} ({summary.worst_id})
+
+## Algorithm Details
+{chr(10).join(algo_summaries)}"""
+
+
+def _fallback_notes(summary: GenerationSummary) -> str:
+    """Simple summary without AI, used when notes generation fails."""
+    return f"""- Best performer: {summary.best_id} with improvement {summary.best_improvement:+.4f}
+- Success rate: {summary.successful}/{summary.total_algorithms} algorithms improved
+- Top approach: {summary.best_description[:100]}"""
+
+
 def generate_notes(
     summary: GenerationSummary,
     brief_content: str,
@@ -164,37 +267,16 @@ def generate_notes(
     Returns:
         Generated notes text or None on failure
     """
-    # Build algorithm summary for prompt
-    algo_summaries = []
-    for algo in summary.algorithms[:10]:  # Top 10 only to limit context
-        status = "improved" if algo['improvement'] > 0 else "regressed"
-        algo_summaries.append(
-            f"- {algo['id']}: {algo['description'][:100]}... "
-            f"(improvement: {algo['improvement']:+.4f}, {status})"
-        )
-
     prompt = f"""Analyze the results of generation {summary.generation} and provide brief learnings.
 
 ## Problem Context (from BRIEF.md)
 {brief_content[:1000]}
 
-## Generation {summary.generation} Results
-- Total algorithms: {summary.total_algorithms}
-- Improved over parent: {summary.successful}
-- Regressed from parent: {summary.failed}
-- Best improvement: {summary.best_improvement:+.4f} ({summary.best_id})
-- Worst: {summary.worst_improvement:+.4f} ({summary.worst_id})
-
-## Algorithm Details
-{chr(10).join(algo_summaries)}
+{_generation_results(summary)}
 
 ## Your Task
 Write 2-4 bullet points summarizing:
-1. What approaches WORKED (led to improvement)
-2. What approaches FAILED (led to regression)
-3. Any patterns you notice
-
-Be specific about the algorithmic techniques, not just generic observations.
+{_TASK_INSTRUCTIONS}
 Format your response as markdown bullet points starting with "- ".
 Keep it concise - this will be appended to accumulated notes.
 """
@@ -209,28 +291,96 @@ Keep it concise - this will be appended to accumulated notes.
             max_wait=120
         )
 
-        # Extract bullet points from output
-        notes = []
-        for line in output.strip().split('\n'):
-            line = line.strip()
-            if line.startswith('- ') or line.startswith('* '):
-                notes.append(line)
-
-        if notes:
-            return '\n'.join(notes)
-
-        # If no bullet points found, return the whole output (trimmed)
-        return output.strip()[:500]
+        # Extract bullet points from output; if none found, return the
+        # whole output (trimmed)
+        notes = '\n'.join(
+            line for line in map(str.strip, output.splitlines())
+            if line.startswith(('- ', '* '))
+        )
+        return notes or output.strip()[:500]
 
     except AIError as e:
         log_error(f"Failed to generate notes: {e}")
         return None
 
 
+def generate_notes_batch(
+    summaries: List[GenerationSummary],
+    brief_content: str,
+    evolution_dir: str
+) -> Dict[int, str]:
+    """
+    Generate notes for several generations with one AI call.
+
+    Args:
+        summaries: Generation summaries to cover
+        brief_content: Content of BRIEF.md for context
+        evolution_dir: Directory for AI working dir
+
+    Returns:
+        Notes text by generation number; generations the response didn't
+        cover (or all of them, if the call or JSON parse failed) are missing
+    """
+    generations = [s.generation for s in summaries]
+    sections = "\n\n".join(_generation_results(s) for s in summaries)
+
+    prompt = f"""Analyze the results of generations {', '.join(map(str, generations))} and provide brief learnings for each.
+
+## Problem Context (from BRIEF.md)
+{brief_content[:1000]}
+
+{sections}
+
+## Your Task
+For EACH generation, write 2-4 bullet points summarizing:
+{_TASK_INSTRUCTIONS}
+Respond with ONLY a JSON array, one object per generation, e.g.:
+[{{"generation": {generations[0]}, "notes": "- first point\\n- second point"}}]
+Keep it concise - these will be appended to accumulated notes.
+"""
+
+    try:
+        output, model = call_ai_with_backoff(
+            prompt,
+            command="ideate",  # Use ideation model pool
+            working_dir=evolution_dir,
+            max_rounds=3,
+            initial_wait=30,
+            max_wait=120
+        )
+    except AIError as e:
+        log_error(f"Failed to generate batched notes: {e}")
+        return {}
+
+    # Tolerate prose or code fences around the array
+    start, end = output.find('['), output.rfind(']')
+    try:
+        entries = json.loads(output[start:end + 1]) if start >= 0 else None
+    except json.JSONDecodeError:
+        entries = None
+    if not isinstance(entries, list):
+        log_warn(f"Batched notes for generations {generations} were not a JSON array")
+        return {}
+
+    notes_by_gen = {}
+    for entry in entries:
+        if not isinstance(entry, dict) or not isinstance(entry.get('notes'), str):
+            continue
+        try:
+            gen = int(entry.get('generation'))
+        except (TypeError, ValueError):
+            continue
+        if gen in generations and entry['notes'].strip():
+            notes_by_gen[gen] = entry['notes'].strip()
+    return notes_by_gen
+
+
 def update_brief_notes(
     evolution_dir: str,
     generation: int,
-    notes: str
+    notes: str,
+    notes_path: Optional[Path] = None,
+    timestamp: Optional[str] = None
 ) -> bool:
     """
     Append notes to BRIEF-notes.md.
@@ -239,28 +389,30 @@ def update_brief_notes(
         evolution_dir: Evolution directory path
         generation: Generation number
         notes: Notes to append
+        notes_path: Precomputed BRIEF-notes.md path (defaults to evolution_dir's)
+        timestamp: Precomputed header timestamp (defaults to now)
 
     Returns:
         True if successful
     """
-    notes_path = Path(evolution_dir) / "BRIEF-notes.md"
-
-    timestamp = datetime.now().strftime("%Y-%m-%d %H:%M")
+    if notes_path is None:
+        notes_path = Path(evolution_dir) / "BRIEF-notes.md"
+    if timestamp is None:
+        timestamp = datetime.now().strftime("%Y-%m-%d %H:%M")
     header = f"\n## Generation {generation} ({timestamp})\n\n"
 
     try:
-        # Read existing content
-        existing = ""
-        if notes_path.exists():
-            existing = notes_path.read_text()
-
-        # Ensure header exists
-        if not existing.strip():
-            existing = "# Evolution Notes\n\nAccumulated learnings from evolution generations.\n"
-
-        # Append new notes
-        with open(notes_path, 'w') as f:
-            f.write(existing.rstrip() + "\n" + header + notes + "\n")
+        with open(notes_path, 'a+') as f:
+            # Ensure header exists (new, empty or whitespace-only file); this
+            # reads only up to the first non-whitespace chunk
+            f.seek(0)
+            if not any(chunk.strip() for chunk in iter(lambda: f.read(4096), '')):
+                f.truncate(0)
+                f.write("# Evolution Notes\n\nAccumulated learnings from evolution generations.\n")
+
+            # Append only the new section; every write ends in a newline, so
+            # the leading "\n" of the header leaves one blank line before it
+            f.write(header + notes + "\n")
 
         log(f"Updated BRIEF-notes.md with generation {generation} learnings")
         return True
@@ -288,33 +440,40 @@ def process_generation(
     Returns:
         True if notes were updated
     """
-    log(f"Analyzing generation {generation}...")
-
-    # Analyze generation
-    summary = analyze_generation(csv_path, generation)
+    summary = _summarize_generation(csv_path, generation)
     if not summary:
-        log(f"Generation {generation} not complete or no data")
         return False
 
-    log(f"Generation {generation}: {summary.successful}/{summary.total_algorithms} improved")
-
-    # Read brief for context
-    brief_content = ""
-    if Path(brief_path).exists():
-        brief_content = Path(brief_path).read_text()[:2000]
-
     # Generate notes
-    notes = generate_notes(summary, brief_content, evolution_dir)
+    notes = generate_notes(summary, _read_brief(brief_path), evolution_dir)
     if not notes:
-        # Fallback to simple summary without AI
-        notes = f"""- Best performer: {summary.best_id} with improvement {summary.best_improvement:+.4f}
-- Success rate: {summary.successful}/{summary.total_algorithms} algorithms improved
-- Top approach: {summary.best_description[:100]}"""
+        notes = _fallback_notes(summary)
 
     # Update notes file
     return update_brief_notes(evolution_dir, generation, notes)
 
 
+def _read_brief(brief_path: str) -> str:
+    """Read BRIEF.md for prompt context (first 2000 chars), or "" if missing."""
+    if Path(brief_path).exists():
+        return Path(brief_path).read_text()[:2000]
+    return ""
+
+
+def _summarize_generation(csv_path: str, generation: int) -> Optional[GenerationSummary]:
+    """Analyze a generation, logging the outcome. None if not complete or no data."""
+    log(f"Analyzing generation {generation}...")
+
+    # Analyze generation
+    summary = analyze_generation(csv_path, generation)
+    if not summary:
+        log(f"Generation {generation} not complete or no data")
+        return None
+
+    log(f"Generation {generation}: {summary.successful}/{summary.total_algorithms} improved")
+    return summary
+
+
 def get_last_processed_generation(evolution_dir: str) -> int:
     """
     Get the last generation that has notes in BRIEF-notes.md.
@@ -327,13 +486,12 @@ def get_last_processed_generation(evolution_dir: str) -> int:
         return 0
 
     try:
-        content = notes_path.read_text()
-        import re
-
-        # Find all "## Generation N" headers
-        matches = re.findall(r'## Generation (\d+)', content)
-        if matches:
-            return max(int(m) for m in matches)
+        with open(notes_path, 'rb') as f:
+            if os.fstat(f.fileno()).st_size == 0:
+                return 0  # mmap can't map an empty file
+            # Let the kernel page the file in; no read into memory or decode
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                return max((int(m.group(1)) for m in _GEN_RE.finditer(mm)), default=0)
 
     except Exception:
         pass
@@ -352,16 +510,64 @@ def process_new_generations(
     Returns:
         Number of generations processed
     """
-    # Get current highest generation in CSV
-    with EvolutionCSV(csv_path) as csv:
-        highest_gen = csv.get_highest_generation()
+    # Get current highest generation in CSV (this read is reused by every
+    # analyze_generation call below via the cached index)
+    index = _csv_index(csv_path)
+    highest_gen = index.highest_gen if index else 0
 
     # Get last processed generation
     last_processed = get_last_processed_generation(evolution_dir)
 
-    processed = 0
+    summaries = []
     for gen in range(last_processed + 1, highest_gen + 1):
-        if process_generation(csv_path, evolution_dir, gen, brief_path):
+        summary = _summarize_generation(csv_path, gen)
+        if summary:
+            summaries.append(summary)
+    if not summaries:
+        return 0
+
+    # AIDEV-NOTE: The AI round-trip dominates, so when catching up on several
+    # generations they are summarized in batched calls (MAX_BATCH_GENERATIONS
+    # per prompt), and both the batches and any per-generation retries for
+    # generations a batch missed run concurrently. Writes stay on this thread
+    # and in generation order, since get_last_processed_generation takes the
+    # max header and BRIEF-notes.md should read chronologically. If we unwind
+    # (the runner's SIGINT/SIGTERM handler raises SystemExit), queued calls are
+    # dropped and running ones killed, so exit doesn't wait on the AI.
+    brief_content = _read_brief(brief_path)
+    notes_by_gen: Dict[int, str] = {}
+    pool = ThreadPoolExecutor(max_workers=MAX_PARALLEL_GENERATIONS)
+    try:
+        if len(summaries) > 1:
+            batches = [
+                summaries[i:i + MAX_BATCH_GENERATIONS]
+                for i in range(0, len(summaries), MAX_BATCH_GENERATIONS)
+            ]
+            for batch_notes in pool.map(
+                lambda batch: generate_notes_batch(batch, brief_content, evolution_dir),
+                batches
+            ):
+                notes_by_gen.update(batch_notes)
+
+        missing = [s for s in summaries if s.generation not in notes_by_gen]
+        for summary, notes in zip(missing, pool.map(
+            lambda summary: generate_notes(summary, brief_content, evolution_dir),
+            missing
+        )):
+            notes_by_gen[summary.generation] = notes or _fallback_notes(summary)
+    except (KeyboardInterrupt, SystemExit):
+        cancel_ai_calls()
+        raise
+    finally:
+        pool.shutdown(wait=False, cancel_futures=True)
+
+    # The batch is written in one go, so it shares one path and timestamp
+    notes_path = Path(evolution_dir) / "BRIEF-notes.md"
+    timestamp = datetime.now().strftime("%Y-%m-%d %H:%M")
+    processed = 0
+    for summary in summaries:
+        gen = summary.generation
+        if update_brief_notes(evolution_dir, gen, notes_by_gen[gen], notes_path, timestamp):
             processed += 1
 
     return processed
@@ -375,8 +581,12 @@ if __name__ == "__main__":
     parser.add_argument('--generation', type=int, help='Specific generation to process')
     args = parser.parse_args()
 
-    # Load config
+    # Load config (libyaml's C loader when PyYAML was built with it)
     import yaml
+    try:
+        from yaml import CSafeLoader as YamlLoader
+    except ImportError:
+        from yaml import SafeLoader as YamlLoader
 
     if args.config:
         config_path = Path(args.config)
@@ -392,7 +602,7 @@ if __name__ == "__main__":
         sys.exit(1)
 
     with open(config_path) as f:
-        data = yaml.safe_load(f) or {}
+        data = yaml.load(f, Loader=YamlLoader) or {}
 
     base_dir = config_path.parent
 
@@ -4,45 +4,102 @@ Sandbox wrapper for claude-evolve evaluations.
 
 Provides multiple layers of isolation:
 1. macOS sandbox-exec: restricts file access, blocks network
-2. Memory limits: via resource module and process monitoring
+2. Memory limits: via cgroup v2 (Linux, when writable), else resource
+   module and process monitoring
 3. CPU time limits: via resource module
 
 AIDEV-NOTE: This is the main entry point for sandboxed evaluation.
 On non-macOS systems, falls back to memory limits only.
 """
+import functools
+import itertools
 import os
 import platform
 import resource
+import select
+import shutil
 import subprocess
 import sys
-import threading
+import tempfile
 import time
 import signal
+from collections import defaultdict, deque
 from pathlib import Path
-from typing import Optional, Tuple, List
+from typing import Dict, Optional, Tuple, List
 
 SCRIPT_DIR = Path(__file__).parent
 SANDBOX_PROFILE = SCRIPT_DIR / "sandbox.sb"
 
+# AIDEV-NOTE: On Linux with a writable cgroup v2 hierarchy whose parent has
+# delegated the memory controller to the base cgroup (see cgroup_base), each
+# evaluation runs in its own cgroup under it with memory.max set.
+# The kernel enforces the limit and OOM-kills the whole group (memory.oom.group),
+# so no polling monitor is needed. Everywhere else we fall back to RLIMIT_AS
+# plus the RSS check in _wait_monitored (/proc, or libproc/ps on macOS).
+CGROUP_ROOT = "/sys/fs/cgroup"
+# Explicit base for per-run cgroups, e.g. /sys/fs/cgroup/claude-evolve to opt
+# in to root-level placement. Unset: nest under the worker's own cgroup.
+CGROUP_BASE = os.environ.get('CLAUDE_EVOLVE_CGROUP_BASE') or None
+_cgroup_seq = itertools.count()
+# How long remove_cgroup waits for a killed cgroup to empty before giving up
+CGROUP_DRAIN_TIMEOUT = 5.0
 
+PR_SET_PDEATHSIG = 1
+
+# How long the parent waits for the cgroup exec shim to report before moving on
+CHILD_SETUP_TIMEOUT = 10.0
+
+# macOS libproc: proc_listpids type for one process group, proc_pid_rusage flavor
+PROC_PGRP_ONLY = 2
+RUSAGE_INFO_V2 = 2
+
+# How often the userspace memory check runs when no cgroup enforces the limit
+MONITOR_INTERVAL = 0.1
+
+IS_LINUX = platform.system() == "Linux"
+
+# Linux exposes per-process RSS in /proc/<pid>/stat; elsewhere we ask ps
+HAS_PROC_STAT = os.path.exists("/proc/self/stat")
+_PAGE_SIZE = os.sysconf("SC_PAGE_SIZE")
+_MB = 1024 * 1024
+
+
+@functools.lru_cache(maxsize=None)
 def is_macos() -> bool:
     """Check if running on macOS."""
     return platform.system() == "Darwin"
 
 
+@functools.lru_cache(maxsize=None)
 def sandbox_exec_available() -> bool:
-    """Check if sandbox-exec is available."""
-    if not is_macos():
-        return False
-    try:
-        result = subprocess.run(
-            ["which", "sandbox-exec"],
-            capture_output=True,
-            timeout=5
-        )
-        return result.returncode == 0
-    except Exception:
-        return False
+    """Check if sandbox-exec is available (cached; checked once per process)."""
+    return is_macos() and shutil.which("sandbox-exec") is not None
+
+
+# AIDEV-NOTE: RLIMIT_AS caps virtual address space, not resident memory, so
+# workloads that mmap large files or reserve big arenas (model weights, JITs,
+# numpy) hit it long before using that much RAM. When a cgroup enforces
+# memory.max, no memory rlimits are set at all. Otherwise on Linux the limit is
+# enforced on RSS by the process-group monitor, so RLIMIT_AS is only a runaway
+# backstop at AS_LIMIT_FACTOR x the limit, and RLIMIT_RSS is set for
+# documentation (the kernel ignores it). Elsewhere (macOS) RLIMIT_AS stays at
+# the limit itself.
+AS_LIMIT_FACTOR = 4
+
+
+def _rlimit_settings(memory_mb: int, cpu_seconds: int) -> List[Tuple[int, int]]:
+    """(resource, limit) pairs for an evaluator; see AS_LIMIT_FACTOR."""
+    settings = []
+    if memory_mb > 0:
+        limit_bytes = memory_mb * _MB
+        if IS_LINUX:
+            settings.append((resource.RLIMIT_RSS, limit_bytes))
+            settings.append((resource.RLIMIT_AS, limit_bytes * AS_LIMIT_FACTOR))
+        else:
+            settings.append((resource.RLIMIT_AS, limit_bytes))
+    if cpu_seconds > 0:
+        settings.append((resource.RLIMIT_CPU, cpu_seconds))
+    return settings
 
 
 def set_resource_limits(memory_mb: int, cpu_seconds: int):
@@ -50,24 +107,430 @@ def set_resource_limits(memory_mb: int, cpu_seconds: int):
     Set resource limits for the current process.
     These are inherited by child processes.
     """
-    if memory_mb > 0:
-        limit_bytes = memory_mb * 1024 * 1024
+    for which, value in _rlimit_settings(memory_mb, cpu_seconds):
         try:
-            resource.setrlimit(resource.RLIMIT_AS, (limit_bytes, limit_bytes))
+            resource.setrlimit(which, (value, value))
         except (OSError, ValueError) as e:
-            print(f"[SANDBOX] Warning: Could not set memory limit: {e}", file=sys.stderr)
+            if which == resource.RLIMIT_AS:
+                print(f"[SANDBOX] Warning: Could not set memory limit: {e}", file=sys.stderr)
+            elif which == resource.RLIMIT_CPU:
+                print(f"[SANDBOX] Warning: Could not set CPU limit: {e}", file=sys.stderr)
 
-    if cpu_seconds > 0:
+
+def _read_cgroup_file(path: str) -> str:
+    # cgroup control files are single small kernel-generated pages
+    fd = os.open(path, os.O_RDONLY)
+    try:
+        return os.read(fd, 4096).decode()
+    finally:
+        os.close(fd)
+
+
+def _write_cgroup_file(path: str, value: str):
+    with open(path, 'w') as f:
+        f.write(value)
+
+
+def _own_cgroup() -> Optional[str]:
+    """This process's cgroup v2 path (relative to CGROUP_ROOT), or None."""
+    try:
+        with open("/proc/self/cgroup") as f:
+            for line in f:
+                hierarchy, _, rest = line.rstrip('\n').partition(':')
+                controllers, _, path = rest.partition(':')
+                if hierarchy == "0" and not controllers:
+                    return path
+    except OSError:
+        pass
+    return None
+
+
+def cgroup_base() -> Optional[str]:
+    """
+    Directory the per-run cgroups are created under, or None if unknown.
+
+    AIDEV-NOTE: Defaults to <worker's own cgroup>/claude-evolve, so evaluators
+    stay inside the caller's unit/session (its limits and accounting) rather
+    than escaping to the root. Memory is only available there if the worker's
+    cgroup already delegates it; in practice that's the root of a container's
+    cgroup namespace, or a subtree set up for us. Anything else uses the RSS
+    monitor unless CLAUDE_EVOLVE_CGROUP_BASE names a delegated base.
+    """
+    if CGROUP_BASE:
+        return CGROUP_BASE
+    own = _own_cgroup()
+    if own is None:
+        return None
+    return os.path.join(CGROUP_ROOT, own.lstrip('/'), "claude-evolve")
+
+
+def create_memory_cgroup(memory_mb: int) -> Optional[str]:
+    """
+    Create a per-evaluation cgroup v2 with memory.max set.
+
+    Returns the cgroup directory, or None if cgroup v2 memory control is
+    unavailable (not Linux, v1 hierarchy, or no permission).
+    """
+    if memory_mb <= 0 or not IS_LINUX:
+        return None
+
+    base = cgroup_base()
+    if base is None:
+        return None
+
+    try:
+        if "memory" not in _read_cgroup_file(os.path.join(CGROUP_ROOT, "cgroup.controllers")).split():
+            return None
+        os.makedirs(base, exist_ok=True)
+        # Memory must already be delegated to the base by its parent. We never
+        # touch controllers above our own subtree (that would change host-wide
+        # state); without delegation the RSS monitor enforces the limit instead.
+        if "memory" not in _read_cgroup_file(os.path.join(base, "cgroup.controllers")).split():
+            return None
+        # The base cgroup holds no processes; it only delegates memory to per-run children
+        if "memory" not in _read_cgroup_file(os.path.join(base, "cgroup.subtree_control")).split():
+            _write_cgroup_file(os.path.join(base, "cgroup.subtree_control"), "+memory")
+    except OSError:
+        return None
+
+    _reap_stale_cgroups(base)
+
+    path = os.path.join(base, f"{os.getpid()}-{next(_cgroup_seq)}")
+    try:
+        os.mkdir(path)
+        _write_cgroup_file(os.path.join(path, "memory.max"), str(memory_mb * _MB))
+    except OSError:
+        remove_cgroup(path)
+        return None
+
+    try:
+        _write_cgroup_file(os.path.join(path, "memory.oom.group"), "1")
+    except OSError:
+        pass  # Kernels before 4.19; the OOM killer then picks single processes
+    try:
+        # Without this, hitting memory.max on a host with swap pages the
+        # evaluator out (slow, then a timeout) instead of OOM-killing it
+        _write_cgroup_file(os.path.join(path, "memory.swap.max"), "0")
+    except OSError:
+        pass  # No swap accounting (swapaccount=0 or no swap controller)
+    return path
+
+
+def _pid_alive(pid: int) -> bool:
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except OSError:
+        pass  # EPERM: exists, owned by someone else
+    return True
+
+
+def _reap_stale_cgroups(base: str):
+    """
+    Kill and remove per-run cgroups whose worker is gone.
+
+    AIDEV-NOTE: Per-run cgroups are named <worker pid>-<seq>. A SIGKILLed worker
+    can't clean up; PR_SET_PDEATHSIG (see make_child_preexec) only kills the
+    evaluator itself, so anything it started lives on in the cgroup until the
+    next evaluation on this host reaps it here. A reused worker pid just
+    postpones the reap.
+    """
+    try:
+        names = os.listdir(base)
+    except OSError:
+        return
+    for name in names:
+        owner, sep, _ = name.partition('-')
+        if not sep or not owner.isdigit() or _pid_alive(int(owner)):
+            continue
+        path = os.path.join(base, name)
+        if os.path.isdir(path):
+            print(f"[SANDBOX] Removing stale cgroup {path}", file=sys.stderr)
+            remove_cgroup(path)
+
+
+def cgroup_oom_killed(path: str) -> bool:
+    """Check whether the kernel OOM-killed anything in the cgroup."""
+    try:
+        for line in _read_cgroup_file(os.path.join(path, "memory.events")).splitlines():
+            key, _, value = line.partition(' ')
+            if key == "oom_kill":
+                return int(value) > 0
+    except (OSError, ValueError):
+        pass
+    return False
+
+
+def cgroup_peak_bytes(path: str) -> Optional[int]:
+    """Peak memory use of the cgroup in bytes (memory.peak, Linux 5.19+), or None."""
+    try:
+        return int(_read_cgroup_file(os.path.join(path, "memory.peak")))
+    except (OSError, ValueError):
+        return None
+
+
+def cgroup_populated(path: str) -> Optional[bool]:
+    """Whether the cgroup (or a descendant) still has live processes, from cgroup.events."""
+    try:
+        for line in _read_cgroup_file(os.path.join(path, "cgroup.events")).splitlines():
+            key, _, value = line.partition(' ')
+            if key == "populated":
+                return int(value) != 0
+    except (OSError, ValueError):
+        pass
+    return None
+
+
+def _kill_cgroup_members(path: str):
+    # Pre-5.14 fallback for cgroup.kill; members forked meanwhile are caught next round
+    try:
+        pids = [int(pid) for pid in _read_cgroup_file(os.path.join(path, "cgroup.procs")).split()]
+    except (OSError, ValueError):
+        return
+    _signal_pids(pids, signal.SIGKILL)
+
+
+def remove_cgroup(path: str):
+    """
+    Kill anything left in the cgroup, wait for it to drain, then remove it.
+
+    rmdir fails with EBUSY while the cgroup is populated, so we wait (up to
+    CGROUP_DRAIN_TIMEOUT) for cgroup.events to report "populated 0" first, and
+    log if the directory still can't be removed rather than leaking it silently.
+    """
+    if not os.path.isdir(path):
+        return
+    try:
+        _write_cgroup_file(os.path.join(path, "cgroup.kill"), "1")
+        have_kill = True
+    except OSError:
+        have_kill = False  # Kernels before 5.14
+
+    deadline = time.monotonic() + CGROUP_DRAIN_TIMEOUT
+    while cgroup_populated(path) and time.monotonic() < deadline:
+        if not have_kill:
+            _kill_cgroup_members(path)
+        time.sleep(0.01)
+
+    while True:
         try:
-            resource.setrlimit(resource.RLIMIT_CPU, (cpu_seconds, cpu_seconds))
-        except (OSError, ValueError) as e:
-            print(f"[SANDBOX] Warning: Could not set CPU limit: {e}", file=sys.stderr)
+            os.rmdir(path)
+            return
+        except FileNotFoundError:
+            return
+        except OSError as e:
+            if time.monotonic() >= deadline:
+                print(f"[SANDBOX] Warning: Could not remove cgroup {path}: {e}", file=sys.stderr)
+                return
+            time.sleep(0.05)
 
 
-def get_process_tree_memory(pid: int) -> float:
-    """Get total memory usage of process tree in MB."""
+@functools.lru_cache(maxsize=None)
+def _load_libproc():
+    """
+    Return (ctypes, proc_listpids, proc_pid_rusage, rusage struct) on macOS, else None.
+
+    Used to sample process-group memory without forking ps every tick.
+    """
+    if not is_macos():
+        return None
+    try:
+        import ctypes
+        libc = ctypes.CDLL(None, use_errno=True)
+        listpids = libc.proc_listpids
+        listpids.argtypes = [ctypes.c_uint32, ctypes.c_uint32, ctypes.c_void_p, ctypes.c_int]
+        listpids.restype = ctypes.c_int
+        pid_rusage = libc.proc_pid_rusage
+        pid_rusage.argtypes = [ctypes.c_int, ctypes.c_int, ctypes.c_void_p]
+        pid_rusage.restype = ctypes.c_int
+    except (OSError, AttributeError):
+        return None
+
+    class RusageInfoV2(ctypes.Structure):
+        # struct rusage_info_v2 from <sys/resource.h>
+        _fields_ = [("ri_uuid", ctypes.c_uint8 * 16)] + [
+            (name, ctypes.c_uint64) for name in (
+                "ri_user_time", "ri_system_time", "ri_pkg_idle_wkups",
+                "ri_interrupt_wkups", "ri_pageins", "ri_wired_size",
+                "ri_resident_size", "ri_phys_footprint", "ri_proc_start_abstime",
+                "ri_proc_exit_abstime", "ri_child_user_time", "ri_child_system_time",
+                "ri_child_pkg_idle_wkups", "ri_child_interrupt_wkups",
+                "ri_child_pageins", "ri_child_elapsed_abstime",
+                "ri_diskio_bytesread", "ri_diskio_byteswritten",
+            )
+        ]
+
+    return ctypes, listpids, pid_rusage, RusageInfoV2
+
+
+def _libproc_group_scan(pgid: int, libproc) -> Tuple[int, List[int]]:
+    """
+    Sum resident bytes of a process group via libproc (macOS).
+
+    Returns (rss_bytes, member_pids). ri_resident_size is the same figure ps
+    reports as rss, so limits mean the same thing as with the ps fallback.
+    """
+    ctypes, listpids, pid_rusage, RusageInfoV2 = libproc
+    int_size = ctypes.sizeof(ctypes.c_int)
+    # A NULL buffer returns the size needed; leave room for new forks
+    needed = listpids(PROC_PGRP_ONLY, pgid, None, 0)
+    if needed <= 0:
+        return 0, []
+    buf = (ctypes.c_int * (needed // int_size + 16))()
+    filled = listpids(PROC_PGRP_ONLY, pgid, buf, ctypes.sizeof(buf))
+
+    info = RusageInfoV2()
+    total = 0
+    pids = []
+    for pid in buf[:max(filled, 0) // int_size]:
+        if pid > 0 and pid_rusage(pid, RUSAGE_INFO_V2, ctypes.byref(info)) == 0:
+            total += info.ri_resident_size
+            pids.append(pid)
+    return total, pids
+
+
+def _read_proc_stat(pid) -> Optional[Tuple[int, int, int]]:
+    """
+    Return (ppid, pgrp, rss_pages) from /proc/<pid>/stat, or None if the process is gone.
+
+    Fields are counted from after the last ')' because the command name can
+    contain spaces and parentheses.
+    """
+    try:
+        with open(f"/proc/{pid}/stat", "rb") as f:
+            data = f.read()
+    except OSError:
+        return None
+    fields = data[data.rfind(b")") + 2:].split()
+    # fields[1] is ppid (stat field 4), fields[2] is pgrp (field 5),
+    # fields[21] is rss in pages (field 24)
+    return int(fields[1]), int(fields[2]), int(fields[21])
+
+
+def _proc_group_scan(pgid: int) -> Tuple[int, List[int]]:
+    """
+    Sum RSS in bytes of a process group plus any descendants of its leader, from
+    one /proc pass.
+
+    Returns (rss_bytes, member_pids). Reads /proc/<pid>/stat directly instead
+    of forking ps.
+
+    AIDEV-NOTE: Evaluators sometimes start helpers that call setsid()/setpgid()
+    (daemonizing pools, some launchers). Those leave the process group but are
+    still children of the tree, so we also walk ppid links from the leader
+    (pid == pgid, since the child calls setsid). Each pid is visited once.
+    """
+    rss_pages: Dict[int, int] = {}
+    children: Dict[int, List[int]] = defaultdict(list)
+    members = []
+    with os.scandir("/proc") as entries:
+        for entry in entries:
+            name = entry.name
+            if not name.isdigit():
+                continue
+            stat = _read_proc_stat(name)
+            if not stat:
+                continue  # Exited mid-scan
+            pid = int(name)
+            ppid, pgrp, rss = stat
+            rss_pages[pid] = rss
+            children[ppid].append(pid)
+            if pgrp == pgid:
+                members.append(pid)
+
+    seen = set(members)
+    queue = deque(members if pgid in seen else members + [pgid])
+    while queue:
+        for child in children.get(queue.popleft(), ()):
+            if child not in seen:
+                seen.add(child)
+                members.append(child)
+                queue.append(child)
+
+    total_pages = sum(rss_pages.get(pid, 0) for pid in members)
+    return total_pages * _PAGE_SIZE, members
+
+
+def _read_statm_rss(path: str) -> Optional[int]:
+    """Resident pages from a /proc/<pid>/statm path, or None if the process is gone."""
+    try:
+        fd = os.open(path, os.O_RDONLY)
+    except OSError:
+        return None
+    try:
+        # "size resident shared text lib data dt", all in pages
+        return int(os.read(fd, 128).split()[1])
+    except (OSError, IndexError, ValueError):
+        return None
+    finally:
+        os.close(fd)
+
+
+class _GroupRssSampler:
+    """
+    Track RSS of one process group on Linux for the monitor loop.
+
+    AIDEV-NOTE: A full /proc scan touches every process on the host, so it only
+    runs every RESCAN_INTERVAL seconds to pick up new children and re-check
+    group membership. Ticks in between read just the known members' statm files
+    (one short line, cheaper for the kernel to produce than stat), dropping pids
+    that have exited.
+    """
+    RESCAN_INTERVAL = 2.0
+
+    def __init__(self, pgid: int):
+        self.pgid = pgid
+        self.pids: List[int] = []
+        self._statm_paths: List[str] = []
+        self._next_scan = 0.0
+
+    def sample_bytes(self) -> int:
+        now = time.monotonic()
+        if now >= self._next_scan:
+            rss_bytes, self.pids = _proc_group_scan(self.pgid)
+            self._statm_paths = [f"/proc/{pid}/statm" for pid in self.pids]
+            self._next_scan = now + self.RESCAN_INTERVAL
+            return rss_bytes
+
+        total_pages = 0
+        pids = []
+        paths = []
+        for pid, path in zip(self.pids, self._statm_paths):
+            pages = _read_statm_rss(path)
+            if pages is not None:
+                total_pages += pages
+                pids.append(pid)
+                paths.append(path)
+        self.pids = pids
+        self._statm_paths = paths
+        return total_pages * _PAGE_SIZE
+
+
+class _PsGroupSampler:
+    """
+    Fallback sampler for systems without /proc: samples the group every tick
+    via get_process_tree_rss (libproc on macOS, else ps).
+    """
+
+    def __init__(self, pgid: int):
+        self.pgid = pgid
+        self.pids: List[int] = []  # Only the group is seen; nothing extra to kill
+
+    def sample_bytes(self) -> int:
+        return get_process_tree_rss(self.pgid, pgid=self.pgid)
+
+
+def get_process_tree_rss(pid: int, pgid: Optional[int] = None) -> int:
+    """Get total RSS of the process's group in bytes (pass pgid if known)."""
     try:
-        pgid = os.getpgid(pid)
+        if pgid is None:
+            pgid = os.getpgid(pid)
+        if HAS_PROC_STAT:
+            return _proc_group_scan(pgid)[0]
+        libproc = _load_libproc()
+        if libproc:
+            return _libproc_group_scan(pgid, libproc)[0]
         result = subprocess.run(
             ["ps", "-o", "rss=", "-g", str(pgid)],
             capture_output=True,
@@ -75,38 +538,91 @@ def get_process_tree_memory(pid: int) -> float:
             timeout=1
         )
         if result.returncode != 0:
-            return 0.0
+            return 0
 
         total_kb = sum(
             int(line.strip())
             for line in result.stdout.strip().split('\n')
             if line.strip().isdigit()
         )
-        return total_kb / 1024.0
+        return total_kb * 1024
     except Exception:
-        return 0.0
+        return 0
 
 
-def monitor_and_kill(process: subprocess.Popen, memory_mb: int) -> Optional[str]:
-    """Monitor process memory and kill if exceeded."""
-    while process.poll() is None:
+def get_process_tree_memory(pid: int) -> float:
+    """Get total memory usage of process tree in MB."""
+    return get_process_tree_rss(pid) / _MB
+
+
+def _signal_pids(pids: List[int], sig: int):
+    for pid in pids:
         try:
-            mem_used = get_process_tree_memory(process.pid)
-            if mem_used > memory_mb:
-                print(f"[SANDBOX] Memory limit exceeded: {mem_used:.1f}MB > {memory_mb}MB", file=sys.stderr)
-                try:
-                    pgid = os.getpgid(process.pid)
-                    os.killpg(pgid, signal.SIGTERM)
-                    time.sleep(2)
-                    if process.poll() is None:
-                        os.killpg(pgid, signal.SIGKILL)
-                except ProcessLookupError:
-                    pass
-                return f"Memory limit exceeded: {mem_used:.1f}MB"
-            time.sleep(0.1)
-        except Exception:
-            time.sleep(0.1)
-    return None
+            os.kill(pid, sig)
+        except OSError:
+            pass
+
+
+def _kill_process_group(process: subprocess.Popen, extra_pids: List[int] = ()):
+    """
+    SIGTERM the child's process group, then SIGKILL it if still alive after 2s.
+
+    extra_pids are descendants that left the group; they get the same signals.
+    """
+    _signal_pids(extra_pids, signal.SIGTERM)
+    pgid = process.pid  # Session leader (start_new_session), so pgid == pid
+    try:
+        os.killpg(pgid, signal.SIGTERM)
+        try:
+            process.wait(timeout=2)
+        except subprocess.TimeoutExpired:
+            os.killpg(pgid, signal.SIGKILL)
+    except ProcessLookupError:
+        pass
+    _signal_pids(extra_pids, signal.SIGKILL)
+
+
+def _escaped_pids(process: subprocess.Popen) -> List[int]:
+    """
+    The child's tree as of now, including descendants that left its group.
+
+    Only Linux can see those (via ppid links, see _proc_group_scan); elsewhere
+    killing the group is all we can do.
+    """
+    if HAS_PROC_STAT:
+        try:
+            return _proc_group_scan(process.pid)[1]
+        except OSError:
+            pass
+    return []
+
+
+def _memory_sampler(process: subprocess.Popen):
+    """
+    Return a sampler giving the child's process-tree RSS in bytes.
+
+    AIDEV-NOTE: The child is spawned with start_new_session, so its pgid is its
+    pid and no getpgid() call is needed, neither here nor on each tick. Using
+    the pid also keeps working after the leader exits while group members live.
+    """
+    if HAS_PROC_STAT:
+        return _GroupRssSampler(process.pid)
+    return _PsGroupSampler(process.pid)
+
+
+# AIDEV-NOTE: The sandbox-exec prefix only depends on the evolution dir and
+# HOME, so it is built once per directory. Path.home() is resolved here, not
+# at import: it can raise (no HOME and no passwd entry), and that should only
+# matter when sandbox-exec is actually used.
+@functools.lru_cache(maxsize=128)
+def _sandbox_prefix(evolution_dir: str) -> Tuple[str, ...]:
+    """Return the sandbox-exec argv prefix for an evolution directory."""
+    return (
+        "sandbox-exec",
+        "-f", str(SANDBOX_PROFILE),
+        "-D", f"EVOLUTION_DIR={evolution_dir}",
+        "-D", f"HOME={Path.home()}",
+    )
 
 
 def build_sandbox_command(
@@ -128,40 +644,136 @@ def build_sandbox_command(
     if not use_sandbox or not sandbox_exec_available():
         return command
 
-    home_dir = str(Path.home())
+    return list(_sandbox_prefix(evolution_dir)) + command
 
-    sandbox_cmd = [
-        "sandbox-exec",
-        "-f", str(SANDBOX_PROFILE),
-        "-D", f"EVOLUTION_DIR={evolution_dir}",
-        "-D", f"HOME={home_dir}",
-    ]
 
-    return sandbox_cmd + command
+@functools.lru_cache(maxsize=None)
+def _load_prctl():
+    """Return libc prctl on Linux, else None (used for PR_SET_PDEATHSIG)."""
+    if not IS_LINUX:
+        return None
+    try:
+        import ctypes
+        return ctypes.CDLL(None, use_errno=True).prctl
+    except (OSError, AttributeError):
+        return None
 
 
-def make_child_preexec(memory_mb: int, cpu_seconds: int):
+def make_child_preexec(memory_mb: int, cpu_seconds: int, cpu_core: Optional[int] = None):
     """
-    Create a preexec_fn that sets resource limits and creates a new session.
+    Create a preexec_fn that sets the evaluator's rlimits and CPU affinity, and
+    has it SIGKILLed if the worker dies (Linux).
 
-    AIDEV-NOTE: Resource limits MUST be set in the child process via preexec_fn,
-    not in the parent. Setting them in the parent would limit the worker itself.
+    AIDEV-NOTE: Resource limits MUST be set in the child (between fork and
+    exec), so they apply only to the evaluator - from its first instruction -
+    and never to the worker. start_new_session does the setsid before this
+    runs. Everything is resolved here in the parent; child_setup only makes
+    syscalls and never prints, since another worker thread may have held
+    stderr's lock at fork time. A refused limit is skipped; the RSS monitor
+    still enforces memory.
+
+    PR_SET_PDEATHSIG covers a SIGKILLed worker (a SIGTERMed one kills the group
+    while unwinding, in run_sandboxed_bytes). It survives exec, and fires when
+    the spawning worker *thread* exits - the main thread here. It only reaches
+    the evaluator itself; with a cgroup, its descendants are reaped by
+    _reap_stale_cgroups.
     """
+    limits = _rlimit_settings(memory_mb, cpu_seconds)
+    affinity = {cpu_core} if cpu_core is not None and hasattr(os, "sched_setaffinity") else None
+    prctl = _load_prctl()
+    pdeathsig = int(signal.SIGKILL)
+    parent_pid = os.getpid()
+
     def child_setup():
-        # Create new session/process group for cleanup
-        os.setsid()
-        # Apply resource limits only to this child process
-        set_resource_limits(memory_mb, cpu_seconds)
+        if prctl is not None:
+            prctl(PR_SET_PDEATHSIG, pdeathsig)
+            # The worker may have died before prctl took effect
+            if os.getppid() != parent_pid:
+                os.kill(os.getpid(), pdeathsig)
+        for which, value in limits:
+            try:
+                resource.setrlimit(which, (value, value))
+            except (OSError, ValueError):
+                pass
+        if affinity is not None:
+            try:
+                os.sched_setaffinity(0, affinity)
+            except OSError:
+                pass
+
     return child_setup
 
 
+def child_setup_command(
+    command: List[str],
+    status_fd: int,
+    memory_mb: int,
+    cgroup_path: str
+) -> List[str]:
+    """
+    Wrap command in the cgroup exec shim (this file run with --child-setup).
+
+    The shim joins the cgroup (falling back to RLIMIT_AS for memory_mb if it
+    can't), reports on status_fd, and then execs command in place (same pid).
+
+    AIDEV-NOTE: A cgroup has to be joined before the evaluator's first
+    instruction, or anything it forks meanwhile escapes; writing cgroup.procs
+    from the parent after Popen returns is too late. The shim is a second
+    interpreter start (-I -S, stdlib only), so it is only used when a cgroup
+    is in play; CPU limits, affinity and the parent-death signal still come
+    from the preexec_fn and are inherited across both execs.
+    """
+    return [
+        sys.executable or "python3", "-I", "-S", str(Path(__file__).resolve()),
+        "--child-setup",
+        str(status_fd),
+        cgroup_path,
+        str(memory_mb),
+        "--",
+    ] + command
+
+
+def _child_setup_main(args: List[str]):
+    """
+    Body of the exec shim: confine this process, report, then exec the command.
+
+    Writes b"1" to the status fd if the cgroup was joined, else b"0" (memory
+    then falls back to RLIMIT_AS and the parent's RSS monitor).
+    """
+    status_fd = int(args[0])
+    cgroup_path = args[1]
+    memory_mb = int(args[2])
+    command = args[4:]  # args[3] is "--"
+
+    joined = False
+    try:
+        _write_cgroup_file(os.path.join(cgroup_path, "cgroup.procs"), str(os.getpid()))
+        joined = True
+    except OSError as e:
+        print(f"[SANDBOX] Warning: Could not join cgroup: {e}", file=sys.stderr)
+        # The cgroup enforces memory on actual usage; rlimits only as fallback
+        set_resource_limits(memory_mb, 0)
+
+    os.write(status_fd, b"1" if joined else b"0")
+    os.close(status_fd)  # Don't leak it into the evaluator
+
+    sys.stderr.flush()
+    try:
+        os.execvp(command[0], command)
+    except OSError as e:
+        print(f"[SANDBOX] Could not run {command[0]}: {e}", file=sys.stderr)
+        sys.stderr.flush()
+        os._exit(127)
+
+
 def run_sandboxed(
     command: List[str],
     evolution_dir: str,
     memory_mb: int = 0,
     cpu_seconds: int = 0,
     timeout_seconds: int = 600,
-    use_sandbox: bool = True
+    use_sandbox: bool = True,
+    cpu_core: Optional[int] = None
 ) -> Tuple[int, str, str]:
     """
     Run a command with sandboxing.
@@ -173,10 +785,163 @@ def run_sandboxed(
         cpu_seconds: CPU time limit in seconds (0 = unlimited)
         timeout_seconds: Wall-clock timeout
         use_sandbox: Whether to use sandbox-exec
+        cpu_core: CPU core to pin the command to (Linux only, None = no pinning)
 
     Returns:
         Tuple of (return_code, stdout, stderr)
     """
+    returncode, stdout, stderr = run_sandboxed_bytes(
+        command, evolution_dir, memory_mb, cpu_seconds, timeout_seconds, use_sandbox, cpu_core
+    )
+    return returncode, stdout.decode('utf-8', errors='replace'), stderr.decode('utf-8', errors='replace')
+
+
+def _open_pidfd(pid: int) -> Optional[int]:
+    """Return a pidfd for pid (readable once it exits), or None if unsupported."""
+    if not hasattr(os, "pidfd_open"):
+        return None
+    try:
+        return os.pidfd_open(pid)
+    except OSError:
+        return None  # Kernels before 5.3
+
+
+def _open_exit_kqueue(pid: int):
+    """Return a kqueue watching pid for exit (readable once it exits), or None."""
+    if not hasattr(select, "kqueue"):
+        return None
+    kq = select.kqueue()
+    try:
+        kq.control([select.kevent(pid, filter=select.KQ_FILTER_PROC,
+                                  flags=select.KQ_EV_ADD | select.KQ_EV_ONESHOT,
+                                  fflags=select.KQ_NOTE_EXIT)], 0, 0)
+    except OSError:
+        kq.close()
+        return None  # Already reaped, or EVFILT_PROC unsupported
+    return kq
+
+
+def _wait_monitored(
+    process: subprocess.Popen,
+    memory_mb: int,
+    timeout_seconds: int
+) -> Tuple[Optional[str], bool]:
+    """
+    Wait for the child to exit while enforcing the memory limit and timeout.
+
+    Returns (memory_error, timed_out).
+
+    AIDEV-NOTE: Output goes straight to temp files (see run_sandboxed_bytes),
+    so nothing here copies it; the loop only wakes for exit, the deadline and
+    memory ticks. Exit is a pidfd (Linux) or an EVFILT_PROC/NOTE_EXIT kqueue
+    (macOS/BSD) becoming readable, so we sleep in the kernel; only when neither
+    is available do we fall back to Popen.wait(timeout), which polls. (signalfd
+    would be another option, but it isn't in the stdlib, and a process-wide
+    SIGCHLD handler would fight the worker's own children.) Kills happen on
+    this thread, so memory_error is always set before we return.
+    """
+    sampler = _memory_sampler(process) if memory_mb > 0 else None
+    limit_bytes = memory_mb * _MB
+    now = time.monotonic()
+    deadline = now + timeout_seconds
+    next_check = now + MONITOR_INTERVAL
+
+    def check_memory() -> Optional[str]:
+        try:
+            mem_used = sampler.sample_bytes()
+        except Exception:
+            return None  # A failed sample shouldn't abort the evaluation
+        if mem_used > limit_bytes:
+            mem_mb = mem_used / _MB
+            print(f"[SANDBOX] Memory limit exceeded: {mem_mb:.1f}MB > {memory_mb}MB", file=sys.stderr)
+            _kill_process_group(process, sampler.pids)
+            return f"Memory limit exceeded: {mem_mb:.1f}MB"
+        return None
+
+    exit_fd = _open_pidfd(process.pid)
+    if exit_fd is None:
+        exit_fd = _open_exit_kqueue(process.pid)
+    try:
+        while process.poll() is None:
+            now = time.monotonic()
+            if now >= deadline:
+                _kill_process_group(process, _escaped_pids(process))
+                return None, True
+
+            wait = deadline - now
+            if sampler:
+                wait = min(wait, max(0.0, next_check - now))
+
+            if exit_fd is not None:
+                select.select([exit_fd], [], [], wait)
+            else:
+                try:
+                    process.wait(timeout=wait)
+                except subprocess.TimeoutExpired:
+                    pass
+
+            if sampler and process.poll() is None and time.monotonic() >= next_check:
+                memory_error = check_memory()
+                if memory_error:
+                    return memory_error, False
+                next_check = time.monotonic() + MONITOR_INTERVAL
+    finally:
+        if isinstance(exit_fd, int):
+            os.close(exit_fd)
+        elif exit_fd is not None:
+            exit_fd.close()
+
+    return None, False
+
+
+def _spawn_in_cgroup(
+    full_cmd: List[str],
+    cgroup_path: str,
+    memory_mb: int,
+    preexec_fn,
+    **popen_kwargs
+) -> Tuple[subprocess.Popen, bool]:
+    """
+    Spawn full_cmd through the cgroup exec shim.
+
+    Returns (process, joined). Waits at most CHILD_SETUP_TIMEOUT for the shim's
+    report; no report (it died, or is stuck) counts as not joined, so the RSS
+    monitor takes over memory enforcement.
+    """
+    status_r, status_w = os.pipe()
+    try:
+        process = subprocess.Popen(
+            child_setup_command(full_cmd, status_w, memory_mb, cgroup_path),
+            preexec_fn=preexec_fn,
+            pass_fds=(status_w,),
+            **popen_kwargs
+        )
+        os.close(status_w)
+        status_w = None
+        if select.select([status_r], [], [], CHILD_SETUP_TIMEOUT)[0]:
+            return process, os.read(status_r, 1) == b"1"
+        print(f"[SANDBOX] Warning: cgroup setup did not report within {CHILD_SETUP_TIMEOUT:g}s", file=sys.stderr)
+        return process, False
+    finally:
+        os.close(status_r)
+        if status_w is not None:
+            os.close(status_w)
+
+
+def run_sandboxed_bytes(
+    command: List[str],
+    evolution_dir: str,
+    memory_mb: int = 0,
+    cpu_seconds: int = 0,
+    timeout_seconds: int = 600,
+    use_sandbox: bool = True,
+    cpu_core: Optional[int] = None
+) -> Tuple[int, bytes, bytes]:
+    """
+    Same as run_sandboxed, but returns the captured output undecoded.
+
+    The CLI uses this to pass evaluator output through byte-for-byte.
+    """
     full_cmd = build_sandbox_command(command, evolution_dir, use_sandbox)
 
     sandbox_active = "sandbox-exec" in full_cmd
@@ -186,50 +951,75 @@ def run_sandboxed(
     print(f"[SANDBOX] Directory: {evolution_dir}", file=sys.stderr)
     print(f"[SANDBOX] Command: {' '.join(command)}", file=sys.stderr)
 
-    try:
-        # AIDEV-NOTE: Resource limits are set via preexec_fn so they only apply
-        # to the child process, not the parent worker
-        process = subprocess.Popen(
-            full_cmd,
-            stdout=subprocess.PIPE,
-            stderr=subprocess.PIPE,
-            cwd=evolution_dir,
-            preexec_fn=make_child_preexec(memory_mb, cpu_seconds)
-        )
+    # AIDEV-NOTE: Output is captured in unlinked temp files rather than pipes:
+    # the kernel writes it straight to the page cache, the parent never wakes
+    # to copy it, and the child can't block on a full pipe. It is read once,
+    # after exit. Output written after exit by descendants still holding the
+    # files is not waited for.
+    out_file = tempfile.TemporaryFile()
+    err_file = tempfile.TemporaryFile()
 
-        # Start memory monitor in background
-        memory_error = None
-        if memory_mb > 0:
-            def monitor():
-                nonlocal memory_error
-                memory_error = monitor_and_kill(process, memory_mb)
+    cgroup_path = create_memory_cgroup(memory_mb)
+    if cgroup_path:
+        print(f"[SANDBOX] Memory enforcement: cgroup v2 ({cgroup_path})", file=sys.stderr)
 
-            monitor_thread = threading.Thread(target=monitor, daemon=True)
-            monitor_thread.start()
+    try:
+        # AIDEV-NOTE: Resource limits only apply to the child, never the worker;
+        # see make_child_preexec. Only when a cgroup must be joined does the
+        # command go through the exec shim (see child_setup_command).
+        popen_kwargs = dict(stdout=out_file, stderr=err_file, cwd=evolution_dir, start_new_session=True)
+        cgroup_active = False
+        if cgroup_path:
+            process, cgroup_active = _spawn_in_cgroup(
+                full_cmd, cgroup_path, memory_mb,
+                make_child_preexec(0, cpu_seconds, cpu_core), **popen_kwargs
+            )
+        else:
+            process = subprocess.Popen(
+                full_cmd,
+                preexec_fn=make_child_preexec(memory_mb, cpu_seconds, cpu_core),
+                **popen_kwargs
+            )
+        if memory_mb > 0 and not cgroup_active:
+            print("[SANDBOX] Memory enforcement: RLIMIT_AS + RSS monitor", file=sys.stderr)
 
         try:
-            stdout, stderr = process.communicate(timeout=timeout_seconds)
-        except subprocess.TimeoutExpired:
+            memory_error, timed_out = _wait_monitored(
+                process, memory_mb if not cgroup_active else 0, timeout_seconds
+            )
+        finally:
+            # Don't leave the evaluator running if we're unwinding (e.g. worker SIGTERM)
+            if process.poll() is None:
+                _kill_process_group(process, _escaped_pids(process))
+
+        if timed_out:
             print(f"[SANDBOX] Timeout after {timeout_seconds}s", file=sys.stderr)
-            try:
-                pgid = os.getpgid(process.pid)
-                os.killpg(pgid, signal.SIGTERM)
-                time.sleep(2)
-                if process.poll() is None:
-                    os.killpg(pgid, signal.SIGKILL)
-            except ProcessLookupError:
-                pass
-            return 124, "", f"Timeout after {timeout_seconds} seconds"
+            return 124, b"", f"Timeout after {timeout_seconds} seconds".encode()
+
+        if cgroup_active:
+            peak = cgroup_peak_bytes(cgroup_path)
+            if peak is not None:
+                print(f"[SANDBOX] Peak memory: {peak / _MB:.1f}MB", file=sys.stderr)
+            if cgroup_oom_killed(cgroup_path):
+                memory_error = f"Memory limit exceeded: {memory_mb}MB (cgroup OOM kill)"
+                print(f"[SANDBOX] {memory_error}", file=sys.stderr)
 
         if memory_error:
-            return 137, "", memory_error
+            return 137, b"", memory_error.encode()
 
-        return process.returncode, stdout.decode('utf-8', errors='replace'), stderr.decode('utf-8', errors='replace')
+        out_file.seek(0)
+        err_file.seek(0)
+        return process.returncode, out_file.read(), err_file.read()
 
     except FileNotFoundError:
-        return 127, "", f"Command not found: {full_cmd[0]}"
+        return 127, b"", f"Command not found: {full_cmd[0]}".encode()
     except Exception as e:
-        return 1, "", f"Error: {e}"
+        return 1, b"", f"Error: {e}".encode()
+    finally:
+        out_file.close()
+        err_file.close()
+        if cgroup_path:
+            remove_cgroup(cgroup_path)
 
 
 def main():
@@ -247,6 +1037,11 @@ def main():
     Note: Use -- to separate wrapper options from the command, especially
     if the command has its own options (like python3 -c "...").
     """
+    # Internal: the cgroup exec shim used by run_sandboxed_bytes
+    if len(sys.argv) > 1 and sys.argv[1] == "--child-setup":
+        _child_setup_main(sys.argv[2:])
+        return
+
     import argparse
 
     parser = argparse.ArgumentParser(
@@ -284,7 +1079,7 @@ def main():
         print(f"Error: Not a directory: {evolution_dir}", file=sys.stderr)
         sys.exit(1)
 
-    returncode, stdout, stderr = run_sandboxed(
+    returncode, stdout, stderr = run_sandboxed_bytes(
         command=args.command,
         evolution_dir=str(evolution_dir),
         memory_mb=args.memory_mb,
@@ -293,11 +1088,14 @@ def main():
         use_sandbox=not args.no_sandbox
     )
 
-    # Output results
+    # Output results as raw bytes; the wrapper never needs to interpret them
+    sys.stderr.flush()
     if stdout:
-        print(stdout, end='')
+        sys.stdout.buffer.write(stdout)
+        sys.stdout.buffer.flush()
     if stderr:
-        print(stderr, file=sys.stderr, end='')
+        sys.stderr.buffer.write(stderr)
+        sys.stderr.buffer.flush()
 
     sys.exit(returncode)
 
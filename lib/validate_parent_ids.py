@@ -4,10 +4,20 @@ Validate parent IDs in AI-generated ideas for claude-evolve ideation.
 """
 
 import csv
+import itertools
 import json
+import os
 import sys
 import re
-from typing import List, Set, Dict, Tuple, Optional
+from typing import Iterable, Iterator, List, Set, Dict, Tuple, Optional
+
+# Per-line patterns for AI output, compiled once
+_FROM_RE = re.compile(r'^From\s+([^:]+):\s*(.+)$', re.IGNORECASE)
+# Blank lines, metadata, and debug/info messages from AI tools
+_SKIP_LINE_RE = re.compile(r'^(?:\s*$|#|\[|==|\s*\[(?:INFO|WARN|ERROR|DEBUG)\])')
+# Numbering, then a bullet (either optional), as two sequential strips would
+_LIST_PREFIX_RE = re.compile(r'^(?:[0-9]+\.?\s*)?(?:-\s*)?')
+_SHELL_ARTIFACTS_RE = re.compile(r'EOF|/dev/null|<<<|>>>|#!/bin/bash')
 
 
 def get_valid_parent_ids(csv_path: str) -> Set[str]:
@@ -19,14 +29,12 @@ def get_valid_parent_ids(csv_path: str) -> Set[str]:
     valid_ids.add("gen00-000")  # Another baseline format
     
     try:
-        with open(csv_path, 'r') as f:
+        # newline='' lets csv.reader keep quoted multi-line descriptions in one row
+        with open(csv_path, 'r', newline='') as f:
             reader = csv.reader(f)
             next(reader, None)  # Skip header
-            for row in reader:
-                if row and len(row) > 0:
-                    candidate_id = row[0].strip()
-                    if candidate_id:
-                        valid_ids.add(candidate_id)
+            # Blank IDs collapse onto "", which is already valid
+            valid_ids.update(row[0].strip() for row in reader if row)
     except Exception as e:
         print(f"[ERROR] Failed to read CSV: {e}", file=sys.stderr)
         
@@ -77,7 +85,7 @@ def parse_ai_line(line: str, idea_type: str) -> Tuple[str, str]:
     
     if idea_type != "novel":
         # Look for "From X:" pattern
-        match = re.match(r'^From\s+([^:]+):\s*(.+)$', line, re.IGNORECASE)
+        match = _FROM_RE.match(line)
         if match:
             parent_id = match.group(1).strip()
             description = match.group(2).strip()
@@ -85,25 +93,12 @@ def parse_ai_line(line: str, idea_type: str) -> Tuple[str, str]:
     return parent_id, description
 
 
-def validate_ai_output(ai_output: str, count: int, idea_type: str, csv_path: str,
-                      top_performers_str: str = "") -> List[Dict[str, str]]:
+def _first_top_performer(top_performers_str: str) -> List[Tuple[str, str, float]]:
     """
-    Validate AI output and return validated ideas.
+    Parse top performers ("id,description,score" lines) up to the first valid entry.
     
-    Args:
-        ai_output: Raw AI output
-        count: Expected number of ideas
-        idea_type: Type of idea (novel, hill-climbing, structural, crossover)
-        csv_path: Path to CSV file
-        top_performers_str: String containing top performers (format: "id,description,score\n...")
-        
-    Returns:
-        List of validated ideas with 'parent_id' and 'description' keys
+    Only that entry is ever used, as the fallback parent, so parsing stops there.
     """
-    # Get valid parent IDs
-    valid_ids = get_valid_parent_ids(csv_path)
-    
-    # Parse top performers
     top_performers = []
     if top_performers_str:
         for line in top_performers_str.strip().split('\n'):
@@ -112,28 +107,37 @@ def validate_ai_output(ai_output: str, count: int, idea_type: str, csv_path: str
                 if len(parts) >= 3:
                     try:
                         top_performers.append((parts[0], parts[1], float(parts[2])))
+                        break
                     except ValueError:
                         pass
+    return top_performers
+
+
+def validate_ai_lines(lines: Iterable[str], idea_type: str, valid_ids: Set[str],
+                      top_performers: List[Tuple[str, str, float]]) -> Iterator[Dict[str, str]]:
+    """
+    Yield validated ideas from AI output lines, one at a time.
     
-    # Process AI output
-    validated_ideas = []
-    lines = ai_output.strip().split('\n')
-    
-    print(f"[DEBUG] Processing {len(lines)} lines from AI output for {idea_type} ideas", file=sys.stderr)
+    Args:
+        lines: Iterable of raw AI output lines (an open file works)
+        idea_type: Type of idea (novel, hill-climbing, structural, crossover)
+        valid_ids: Valid parent IDs
+        top_performers: Parsed top performers, best first
+        
+    Yields:
+        Dicts with 'parent_id' and 'description' keys
+    """
+    if idea_type == "novel":
+        yield from _novel_ideas(lines)
+        return
     
     for line in lines:
-        # Skip empty lines and metadata
-        if not line or line.strip() == '' or line.startswith('#') or line.startswith('[') or line.startswith('=='):
-            continue
-        
-        # Skip debug/info messages from AI tools
-        if line.strip().startswith('[INFO]') or line.strip().startswith('[WARN]') or line.strip().startswith('[ERROR]') or line.strip().startswith('[DEBUG]'):
+        # Skip empty lines, metadata and debug/info messages from AI tools
+        if _SKIP_LINE_RE.match(line):
             continue
         
-        # Clean the line
-        line = line.strip()
-        line = re.sub(r'^[0-9]+\.?\s*', '', line)  # Remove numbering
-        line = re.sub(r'^-\s*', '', line)  # Remove bullet points
+        # Clean the line: remove numbering and bullet points
+        line = _LIST_PREFIX_RE.sub('', line.strip(), 1)
         
         # Parse parent ID and description
         parent_id, description = parse_ai_line(line, idea_type)
@@ -141,12 +145,14 @@ def validate_ai_output(ai_output: str, count: int, idea_type: str, csv_path: str
         # Validate parent ID
         if parent_id and parent_id not in valid_ids:
             print(f"[WARN] Invalid parent ID '{parent_id}' for {idea_type} idea - fixing...", file=sys.stderr)
-            print(f"[INFO] Valid parent IDs are: {', '.join(sorted([id for id in valid_ids if id]))[:200]}...", file=sys.stderr)
+            # Bounded sample - sorting every candidate ID just for a log line is wasteful
+            sample = sorted(itertools.islice((i for i in valid_ids if i), 20))
+            print(f"[INFO] Valid parent IDs (sample): {', '.join(sample)}", file=sys.stderr)
             parent_id = validate_and_fix_parent_id(parent_id, valid_ids, idea_type, top_performers)
             print(f"[INFO] Fixed parent ID to: '{parent_id}'", file=sys.stderr)
         
-        # For non-novel ideas, ensure we have a parent
-        if idea_type != "novel" and not parent_id:
+        # Non-novel ideas always need a parent
+        if not parent_id:
             if top_performers:
                 parent_id = top_performers[0][0]
                 print(f"[INFO] Assigned parent ID '{parent_id}' to idea without parent", file=sys.stderr)
@@ -158,19 +164,68 @@ def validate_ai_output(ai_output: str, count: int, idea_type: str, csv_path: str
         if len(description) < 20:
             continue
         
-        if any(word in description for word in ['EOF', '/dev/null', '<<<', '>>>', '#!/bin/bash']):
+        if _SHELL_ARTIFACTS_RE.search(description):
             print(f"[WARN] Skipping description with shell artifacts: {description[:50]}...", file=sys.stderr)
             continue
         
-        validated_ideas.append({
+        yield {
             'parent_id': parent_id,
             'description': description
-        })
+        }
+
+
+def _novel_ideas(lines: Iterable[str]) -> Iterator[Dict[str, str]]:
+    """
+    Novel-idea specialization of validate_ai_lines.
+    
+    Novel ideas never carry a parent, so there is no "From X:" parsing, parent
+    lookup or top-performer fallback - only cleanup and the description checks.
+    """
+    for line in lines:
+        if _SKIP_LINE_RE.match(line):
+            continue
         
-        if len(validated_ideas) >= count:
-            break
+        description = _LIST_PREFIX_RE.sub('', line.strip(), 1)
+        
+        if len(description) < 20:
+            continue
+        
+        if _SHELL_ARTIFACTS_RE.search(description):
+            print(f"[WARN] Skipping description with shell artifacts: {description[:50]}...", file=sys.stderr)
+            continue
+        
+        yield {
+            'parent_id': "",
+            'description': description
+        }
+
+
+def validate_ai_output(ai_output: str, count: int, idea_type: str, csv_path: str,
+                      top_performers_str: str = "") -> List[Dict[str, str]]:
+    """
+    Validate AI output and return validated ideas.
     
-    return validated_ideas
+    Args:
+        ai_output: Raw AI output
+        count: Expected number of ideas
+        idea_type: Type of idea (novel, hill-climbing, structural, crossover)
+        csv_path: Path to CSV file
+        top_performers_str: String containing top performers (format: "id,description,score\n...")
+        
+    Returns:
+        List of validated ideas with 'parent_id' and 'description' keys
+    """
+    # Get valid parent IDs
+    valid_ids = get_valid_parent_ids(csv_path)
+    
+    top_performers = _first_top_performer(top_performers_str)
+    
+    # Process AI output
+    lines = ai_output.strip().split('\n')
+    
+    print(f"[DEBUG] Processing {len(lines)} lines from AI output for {idea_type} ideas", file=sys.stderr)
+    
+    return list(itertools.islice(validate_ai_lines(lines, idea_type, valid_ids, top_performers), count))
 
 
 def main():
@@ -185,10 +240,12 @@ def main():
     csv_path = sys.argv[4]
     top_performers_file = sys.argv[5] if len(sys.argv) > 5 else None
     
+    # AIDEV-NOTE: The AI output file is streamed line by line into
+    # validate_ai_lines and reading stops once `count` ideas are collected, so
+    # peak memory tracks one line rather than the whole output. Only small
+    # files are read whole, for the empty/short sanity checks below.
     try:
-        # Read AI output
-        with open(ai_output_file, 'r') as f:
-            ai_output = f.read()
+        ai_output_size = os.path.getsize(ai_output_file)
     except Exception as e:
         print(f"[ERROR] Failed to read AI output file {ai_output_file}: {e}", file=sys.stderr)
         sys.exit(1)
@@ -203,15 +260,24 @@ def main():
             print(f"[WARN] Failed to read top performers file {top_performers_file}: {e}", file=sys.stderr)
     
     # Check if AI output is empty or looks like an error
-    if not ai_output.strip():
-        print(f"[ERROR] AI output is empty", file=sys.stderr)
-        sys.exit(1)
-    
-    if len(ai_output) < 50:
+    if ai_output_size < 50:
+        with open(ai_output_file, 'r') as f:
+            ai_output = f.read()
+        if not ai_output.strip():
+            print(f"[ERROR] AI output is empty", file=sys.stderr)
+            sys.exit(1)
         print(f"[WARN] AI output is suspiciously short: {ai_output}", file=sys.stderr)
     
     # Validate
-    validated_ideas = validate_ai_output(ai_output, count, idea_type, csv_path, top_performers_str)
+    valid_ids = get_valid_parent_ids(csv_path)
+    top_performers = _first_top_performer(top_performers_str)
+    try:
+        with open(ai_output_file, 'r') as f:
+            validated_ideas = list(itertools.islice(
+                validate_ai_lines(f, idea_type, valid_ids, top_performers), count))
+    except Exception as e:
+        print(f"[ERROR] Failed to read AI output file {ai_output_file}: {e}", file=sys.stderr)
+        sys.exit(1)
     
     # Output validated ideas as JSON
     print(json.dumps(validated_ideas))
@@ -219,7 +285,8 @@ def main():
     # Return error ONLY if no valid ideas at all
     if len(validated_ideas) == 0:
         print(f"[ERROR] No valid ideas found in AI output. First 500 chars:", file=sys.stderr)
-        print(ai_output[:500], file=sys.stderr)
+        with open(ai_output_file, 'r') as f:
+            print(f.read(500), file=sys.stderr)
         sys.exit(1)
     elif len(validated_ideas) < count:
         print(f"[WARN] Only validated {len(validated_ideas)} out of {count} requested {idea_type} ideas", file=sys.stderr)
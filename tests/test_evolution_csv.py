@@ -0,0 +1,112 @@
+#!/usr/bin/env python3
+"""
+Tests for lib/evolution_csv.py.
+
+Run with: python3 -m unittest discover -s tests
+"""
+
+import os
+import sys
+import tempfile
+import unittest
+from pathlib import Path
+from unittest import mock
+
+ROOT_DIR = Path(__file__).parent.parent
+if str(ROOT_DIR) not in sys.path:
+    sys.path.insert(0, str(ROOT_DIR))
+
+from lib.evolution_csv import EvolutionCSV
+
+HEADER = "id,basedOnId,description,performance,status\n"
+
+
+class PendingJournalTest(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.csv_path = os.path.join(self.tmp.name, "evolution.csv")
+        with open(self.csv_path, "w") as f:
+            f.write(HEADER)
+            f.write("gen01-001,,first idea,,running\n")
+            f.write("gen01-002,,second idea,0.5,complete\n")
+        self.journal = self.csv_path + ".pending.jrnl"
+        with open(self.journal, "w") as f:
+            f.write("gen01-001\ngen01-002\n")
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def test_replay_resets_and_removes_journal(self):
+        with EvolutionCSV(self.csv_path) as csv:
+            self.assertEqual(csv.replay_pending_journal(), 1)
+            self.assertEqual(csv.get_candidate_info("gen01-001")["status"], "pending")
+            self.assertEqual(csv.get_candidate_info("gen01-002")["status"], "complete")
+        self.assertEqual(os.listdir(self.tmp.name), ["evolution.csv"])
+
+    def test_failed_write_keeps_journal(self):
+        with EvolutionCSV(self.csv_path) as csv:
+            with mock.patch.object(csv, "_write_csv", side_effect=OSError("disk full")):
+                with self.assertRaises(OSError):
+                    csv.replay_pending_journal()
+        with open(self.journal) as f:
+            self.assertEqual(f.read(), "gen01-001\ngen01-002\n")
+
+        # The entries are applied by the next replay
+        with EvolutionCSV(self.csv_path) as csv:
+            self.assertEqual(csv.replay_pending_journal(), 1)
+
+    def test_failed_write_merges_into_new_journal(self):
+        def write_then_fail(rows):
+            with open(self.journal, "a") as f:
+                f.write("gen01-003\n")  # Another worker interrupted meanwhile
+            raise OSError("disk full")
+
+        with EvolutionCSV(self.csv_path) as csv:
+            with mock.patch.object(csv, "_write_csv", side_effect=write_then_fail):
+                with self.assertRaises(OSError):
+                    csv.replay_pending_journal()
+        with open(self.journal) as f:
+            self.assertEqual(sorted(f.read().split()), ["gen01-001", "gen01-002", "gen01-003"])
+
+
+class UpdateCandidateFieldsTest(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.csv_path = os.path.join(self.tmp.name, "evolution.csv")
+        with open(self.csv_path, "w") as f:
+            f.write(HEADER)
+            f.write("gen01-001,,first idea\n")
+            f.write("gen01-002,,second idea\n")
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def test_new_column_pads_all_rows(self):
+        with EvolutionCSV(self.csv_path) as csv:
+            self.assertTrue(csv.update_candidate_fields(
+                "gen01-002", {"performance": "0.7", "status": "complete", "sharpe": "1.5"}))
+        with open(self.csv_path) as f:
+            lines = f.read().splitlines()
+        self.assertEqual(lines, [
+            "id,basedOnId,description,performance,status,sharpe",
+            "gen01-001,,first idea,,,",
+            "gen01-002,,second idea,0.7,complete,1.5",
+        ])
+
+    def test_existing_columns_only_pad_target_row(self):
+        with EvolutionCSV(self.csv_path) as csv:
+            self.assertTrue(csv.update_candidate_fields(
+                "gen01-002", {"performance": "0.7", "status": "complete"}))
+        with open(self.csv_path) as f:
+            lines = f.read().splitlines()
+        self.assertEqual(lines, [
+            "id,basedOnId,description,performance,status",
+            "gen01-001,,first idea",
+            "gen01-002,,second idea,0.7,complete",
+        ])
+
+
+if __name__ == '__main__':
+    unittest.main()
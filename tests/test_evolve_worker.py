@@ -0,0 +1,101 @@
+#!/usr/bin/env python3
+"""
+Tests for evaluator output parsing and syntax checks in lib/evolve_worker.py.
+
+Run with: python3 -m unittest discover -s tests
+"""
+
+import subprocess
+import sys
+import tempfile
+import unittest
+from pathlib import Path
+from types import SimpleNamespace
+from unittest import mock
+
+ROOT_DIR = Path(__file__).parent.parent
+if str(ROOT_DIR) not in sys.path:
+    sys.path.insert(0, str(ROOT_DIR))
+
+from lib import evolve_worker
+from lib.evolve_worker import Worker
+
+
+def parse(output):
+    # _parse_evaluator_output doesn't touch worker state
+    return Worker._parse_evaluator_output(None, output)
+
+
+class ParseEvaluatorOutputTest(unittest.TestCase):
+
+    def test_json_performance(self):
+        score, data = parse('starting\n{"performance": 0.75, "sharpe": 1.2}\n')
+        self.assertEqual(score, 0.75)
+        self.assertEqual(data, {"performance": 0.75, "sharpe": 1.2})
+
+    def test_trailing_log_json_does_not_replace_result(self):
+        output = (
+            '{"performance": 0.9, "trades": 12}\n'
+            '{"level": "info", "msg": "evaluation finished"}\n'
+        )
+        score, data = parse(output)
+        self.assertEqual(score, 0.9)
+        self.assertEqual(data, {"performance": 0.9, "trades": 12})
+
+    def test_last_scored_json_wins(self):
+        score, _ = parse('{"score": 0.1}\n{"score": 0.2}\n')
+        self.assertEqual(score, 0.2)
+
+    def test_log_json_only_falls_back_to_number(self):
+        score, data = parse('{"msg": "done"}\n0.5\n')
+        self.assertEqual(score, 0.5)
+        self.assertEqual(data, {})
+
+    def test_legacy_score_prefix(self):
+        score, _ = parse('progress...\nSCORE: 42.5\n')
+        self.assertEqual(score, 42.5)
+
+    def test_no_score(self):
+        score, data = parse('nothing useful here\n')
+        self.assertIsNone(score)
+        self.assertEqual(data, {})
+
+
+class SyntaxErrorTest(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.bad = Path(self.tmp.name) / "bad.py"
+        self.bad.write_text("def f(:\n    pass\n")
+        self.good = Path(self.tmp.name) / "good.py"
+        self.good.write_text("x = 1\n")
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def worker(self, python_cmd):
+        # _syntax_error only needs config.python_cmd and the cached version check
+        return SimpleNamespace(config=SimpleNamespace(python_cmd=python_cmd), _same_python=None)
+
+    def test_same_interpreter_compiles_in_process(self):
+        worker = self.worker(sys.executable)
+        with mock.patch.object(subprocess, "run", wraps=subprocess.run) as run:
+            self.assertIsNone(Worker._syntax_error(worker, self.good))
+            self.assertIn("SyntaxError", Worker._syntax_error(worker, self.bad))
+        run.assert_not_called()
+        self.assertTrue(worker._same_python)
+
+    def test_other_version_uses_py_compile(self):
+        worker = self.worker(sys.executable)
+        with mock.patch.object(evolve_worker, "_same_python_version", return_value=False), \
+                mock.patch.object(subprocess, "run", wraps=subprocess.run) as run:
+            self.assertIsNone(Worker._syntax_error(worker, self.good))
+            self.assertIn("SyntaxError", Worker._syntax_error(worker, self.bad))
+        self.assertEqual(run.call_args[0][0][:3], [sys.executable, "-m", "py_compile"])
+
+    def test_missing_python_cmd_is_not_same_version(self):
+        self.assertFalse(evolve_worker._same_python_version("no-such-python-for-tests"))
+
+
+if __name__ == '__main__':
+    unittest.main()
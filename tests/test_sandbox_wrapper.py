@@ -0,0 +1,147 @@
+#!/usr/bin/env python3
+"""
+Tests for the exit wait and cgroup placement in lib/sandbox_wrapper.py.
+
+Run with: python3 -m unittest discover -s tests
+"""
+
+import os
+import select
+import subprocess
+import sys
+import tempfile
+import time
+import unittest
+from pathlib import Path
+from unittest import mock
+
+ROOT_DIR = Path(__file__).parent.parent
+if str(ROOT_DIR) not in sys.path:
+    sys.path.insert(0, str(ROOT_DIR))
+
+from lib import sandbox_wrapper
+
+
+def spawn_sleep(seconds):
+    return subprocess.Popen(["sleep", str(seconds)], start_new_session=True)
+
+
+@unittest.skipUnless(hasattr(select, "kqueue"), "kqueue not available (macOS/BSD only)")
+class KqueueExitWaitTest(unittest.TestCase):
+
+    def test_kqueue_readable_on_exit(self):
+        process = spawn_sleep(0.2)
+        kq = sandbox_wrapper._open_exit_kqueue(process.pid)
+        self.assertIsNotNone(kq)
+        try:
+            self.assertEqual(select.select([kq], [], [], 0)[0], [])
+            start = time.monotonic()
+            readable = select.select([kq], [], [], 5)[0]
+            self.assertEqual(readable, [kq])
+            self.assertLess(time.monotonic() - start, 2)
+            self.assertEqual(process.wait(timeout=1), 0)
+        finally:
+            kq.close()
+
+    def test_kqueue_unavailable_for_reaped_pid(self):
+        process = spawn_sleep(0)
+        process.wait()
+        self.assertIsNone(sandbox_wrapper._open_exit_kqueue(process.pid))
+
+    def test_wait_monitored_uses_kqueue(self):
+        process = spawn_sleep(0.3)
+        opened = []
+
+        def open_kqueue(pid):
+            kq = real_open_kqueue(pid)
+            opened.append(kq)
+            return kq
+
+        real_open_kqueue = sandbox_wrapper._open_exit_kqueue
+        with mock.patch.object(sandbox_wrapper, "_open_pidfd", return_value=None), \
+                mock.patch.object(sandbox_wrapper, "_open_exit_kqueue", side_effect=open_kqueue), \
+                mock.patch.object(process, "wait", wraps=process.wait) as wait:
+            result = sandbox_wrapper._wait_monitored(process, 0, 10)
+        self.assertEqual(result, (None, False))
+        self.assertEqual(len(opened), 1)
+        self.assertIsNotNone(opened[0])
+        self.assertTrue(opened[0].closed)
+        # Popen.wait(timeout) is the polling fallback; the kqueue path never uses it
+        wait.assert_not_called()
+        self.assertEqual(process.returncode, 0)
+
+    def test_wait_monitored_timeout_with_kqueue(self):
+        process = spawn_sleep(30)
+        with mock.patch.object(sandbox_wrapper, "_open_pidfd", return_value=None):
+            start = time.monotonic()
+            result = sandbox_wrapper._wait_monitored(process, 0, 1)
+        self.assertEqual(result, (None, True))
+        self.assertLess(time.monotonic() - start, 5)
+        self.assertIsNotNone(process.poll())
+
+
+class ExitWaitTest(unittest.TestCase):
+    """The platform's default exit wait (pidfd, kqueue or Popen.wait polling)."""
+
+    def test_wait_monitored_returns_on_exit(self):
+        process = spawn_sleep(0.2)
+        start = time.monotonic()
+        self.assertEqual(sandbox_wrapper._wait_monitored(process, 0, 10), (None, False))
+        self.assertLess(time.monotonic() - start, 2)
+        self.assertEqual(process.returncode, 0)
+
+    def test_wait_monitored_polling_fallback(self):
+        process = spawn_sleep(0.2)
+        with mock.patch.object(sandbox_wrapper, "_open_pidfd", return_value=None), \
+                mock.patch.object(sandbox_wrapper, "_open_exit_kqueue", return_value=None):
+            self.assertEqual(sandbox_wrapper._wait_monitored(process, 0, 10), (None, False))
+        self.assertEqual(process.returncode, 0)
+
+
+@unittest.skipUnless(sandbox_wrapper.HAS_PROC_STAT, "needs /proc to find escaped descendants")
+class EscapedDescendantKillTest(unittest.TestCase):
+
+    def test_timeout_kills_descendant_that_left_the_group(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            pid_file = os.path.join(tmp, "pid")
+            script = (
+                "import subprocess, time\n"
+                "p = subprocess.Popen(['sleep', '60'], start_new_session=True)\n"
+                f"open({pid_file!r}, 'w').write(str(p.pid))\n"
+                "time.sleep(60)\n"
+            )
+            with mock.patch.object(sandbox_wrapper, "create_memory_cgroup", return_value=None):
+                code, _, _ = sandbox_wrapper.run_sandboxed_bytes(
+                    [sys.executable, "-c", script], tmp, timeout_seconds=1, use_sandbox=False
+                )
+            self.assertEqual(code, 124)
+            with open(pid_file) as f:
+                escaped = int(f.read())
+        deadline = time.monotonic() + 5
+        while os.path.exists(f"/proc/{escaped}") and time.monotonic() < deadline:
+            time.sleep(0.05)
+        self.assertFalse(os.path.exists(f"/proc/{escaped}"))
+
+
+class CgroupBaseTest(unittest.TestCase):
+
+    def test_nests_under_own_cgroup(self):
+        with mock.patch.object(sandbox_wrapper, "CGROUP_BASE", None), \
+                mock.patch.object(sandbox_wrapper, "_own_cgroup", return_value="/user.slice/run-1.scope"):
+            self.assertEqual(sandbox_wrapper.cgroup_base(),
+                             "/sys/fs/cgroup/user.slice/run-1.scope/claude-evolve")
+
+    def test_explicit_base_wins(self):
+        with mock.patch.object(sandbox_wrapper, "CGROUP_BASE", "/sys/fs/cgroup/claude-evolve"), \
+                mock.patch.object(sandbox_wrapper, "_own_cgroup", return_value="/user.slice"):
+            self.assertEqual(sandbox_wrapper.cgroup_base(), "/sys/fs/cgroup/claude-evolve")
+
+    def test_no_cgroup_v2(self):
+        with mock.patch.object(sandbox_wrapper, "CGROUP_BASE", None), \
+                mock.patch.object(sandbox_wrapper, "_own_cgroup", return_value=None):
+            self.assertIsNone(sandbox_wrapper.cgroup_base())
+            self.assertIsNone(sandbox_wrapper.create_memory_cgroup(100))
+
+
+if __name__ == '__main__':
+    unittest.main()